@@ -1,28 +1,30 @@
 import asyncio
-import pyautogui
-from typing import Tuple, Optional
+from typing import Set, Tuple, Optional
+from bot.input_backend import PyAutoGuiInput
 from utils.logger import setup_logger
-from config.settings import BOT_SETTINGS, ACTION_SETTINGS
+from config.settings import ACTION_SETTINGS
+from utils.tracing import traced, tracer
 
 
 class ActionHandler:
     """Handles all bot actions like teleport, movement, etc."""
     
-    def __init__(self):
+    def __init__(self, input_backend=None):
         self.logger = setup_logger()
         self.window_region = None
         
-        # Disable pyautogui failsafe for automation
-        pyautogui.FAILSAFE = False
+        # Keys currently held down, so they can always be released (see release_all_keys())
+        self.held_keys: Set[str] = set()
         
-        # Set default delays
-        pyautogui.PAUSE = BOT_SETTINGS.get('action_delay', 0.1)
+        # Keyboard/mouse backend, pyautogui unless one is injected (e.g. the simulator)
+        self.input = input_backend or PyAutoGuiInput()
     
     def set_window_region(self, window_region: Optional[Tuple[int, int, int, int]]):
         """Set the window region for actions."""
         self.window_region = window_region
         self.logger.info(f"Action handler window region set to: {window_region}")
     
+    @traced('action')
     async def teleport(self):
         """
         Execute teleport action by pressing the configured key and waiting.
@@ -36,11 +38,12 @@ class ActionHandler:
             
             # Press the teleport key
             self.logger.debug(f"Pressing key '{teleport_key}' for teleport")
-            pyautogui.press(teleport_key)
+            self._send_input('press', teleport_key)
             
             # Wait for teleport to complete
             self.logger.debug(f"Waiting {wait_time} seconds for teleport to complete...")
-            await asyncio.sleep(wait_time)
+            with tracer.span('teleport_wait', 'wait'):
+                await asyncio.sleep(wait_time)
             
             self.logger.info("✅ Teleport action completed successfully")
             
@@ -48,9 +51,12 @@ class ActionHandler:
             self.logger.error(f"❌ Teleport action failed: {e}")
             raise
     
+    @traced('action')
     async def walking_to_beach(self):
         """
-        Execute walking to beach sequence:
+        Execute the walking to beach sequence from ACTION_SETTINGS['walking_to_beach']['steps'].
+        
+        By default:
         - Down arrow for 4 seconds
         - Left arrow for 2 seconds  
         - Down arrow for 1 second
@@ -60,25 +66,10 @@ class ActionHandler:
         self.logger.info("🏖️ Starting walking to beach action...")
         
         try:
-            # Step 1: Down for 4 seconds
-            self.logger.debug("Step 1: Walking down for 4 seconds")
-            await self.press_key('down', 4.0)
-            
-            # Step 2: Left for 2 seconds
-            self.logger.debug("Step 2: Walking left for 2 seconds")
-            await self.press_key('left', 2.0)
-            
-            # Step 3: Down for 1 second
-            self.logger.debug("Step 3: Walking down for 1 second")
-            await self.press_key('down', 1.0)
-            
-            # Step 4: Right for 2 seconds
-            self.logger.debug("Step 4: Walking right for 2 seconds")
-            await self.press_key('right', 2.0)
-            
-            # Step 5: Down for 1 second
-            self.logger.debug("Step 5: Walking down for 1 second")
-            await self.press_key('down', 1.0)
+            steps = ACTION_SETTINGS['walking_to_beach']['steps']
+            for number, (direction, duration) in enumerate(steps, 1):
+                self.logger.debug(f"Step {number}: Walking {direction} for {duration} seconds")
+                await self.press_key(direction, duration)
             
             self.logger.info("✅ Walking to beach action completed successfully")
             
@@ -86,6 +77,7 @@ class ActionHandler:
             self.logger.error(f"❌ Walking to beach action failed: {e}")
             raise
     
+    @traced('action')
     async def fish(self):
         """
         Execute fish action by pressing the 'z' key.
@@ -95,7 +87,7 @@ class ActionHandler:
         try:
             # Press the 'z' key to start fishing
             self.logger.debug("Pressing key 'z' to fish")
-            pyautogui.press('z')
+            self._send_input('press', 'z')
             
             self.logger.info("✅ Fish action completed successfully")
             
@@ -114,17 +106,41 @@ class ActionHandler:
         try:
             if hold_duration > 0:
                 self.logger.debug(f"Holding key '{key}' for {hold_duration} seconds")
-                pyautogui.keyDown(key)
-                await asyncio.sleep(hold_duration)
-                pyautogui.keyUp(key)
+                self.held_keys.add(key)
+                self._send_input('key_down', key)
+                try:
+                    with tracer.span('hold', 'wait', key=key):
+                        await asyncio.sleep(hold_duration)
+                finally:
+                    # Runs on cancellation too, a key must never stay held
+                    self.release_key(key)
             else:
                 self.logger.debug(f"Pressing key '{key}'")
-                pyautogui.press(key)
+                self._send_input('press', key)
                 
         except Exception as e:
             self.logger.error(f"Failed to press key '{key}': {e}")
             raise
     
+    def _send_input(self, method: str, key: str):
+        """Dispatch a key event to the input backend."""
+        with tracer.span(method, 'input', key=key):
+            getattr(self.input, method)(key)
+    
+    def release_key(self, key: str):
+        """Release a held key, if it is still held."""
+        if key in self.held_keys:
+            self.held_keys.discard(key)
+            self._send_input('key_up', key)
+    
+    def release_all_keys(self):
+        """Release every held key, trying all of them even if one fails."""
+        for key in list(self.held_keys):
+            try:
+                self.release_key(key)
+            except Exception as e:
+                self.logger.error(f"Failed to release key '{key}': {e}")
+    
     async def click_at_position(self, x: int, y: int, button: str = 'left', clicks: int = 1):
         """
         Click at a specific position.
@@ -136,7 +152,8 @@ class ActionHandler:
         """
         try:
             self.logger.debug(f"Clicking at position ({x}, {y}) with {button} button, {clicks} clicks")
-            pyautogui.click(x, y, clicks=clicks, button=button)
+            with tracer.span('click', 'input', x=x, y=y):
+                self.input.click(x, y, button=button, clicks=clicks)
             
         except Exception as e:
             self.logger.error(f"Failed to click at position ({x}, {y}): {e}")
@@ -150,4 +167,5 @@ class ActionHandler:
             duration: Time to wait in seconds
         """
         self.logger.debug(f"Waiting {duration} seconds...")
-        await asyncio.sleep(duration)
+        with tracer.span('wait', 'wait'):
+            await asyncio.sleep(duration)
@@ -0,0 +1,375 @@
+import asyncio
+import numpy as np
+from typing import Dict, Any, Callable, Optional, Iterable
+from bot.actions import ActionHandler
+from bot.roi import RoiPlanner
+from bot.scheduler import DetectionScheduler
+from bot.screen import ScreenCapture
+from bot.sprites import SpriteIndex
+from config.settings import BOT_SETTINGS, BATTLE_SETTINGS
+from utils.logger import setup_logger
+from utils.tracing import traced, tracer
+
+
+class BattleState:
+    """Screen states the battle handler can tell apart."""
+
+    OVERWORLD = 'overworld'
+    MESSAGE = 'message'  # overworld dialog, e.g. "Oh! A bite!"
+    TRANSITION = 'transition'  # black frames while entering/leaving a battle
+    BATTLE = 'battle'  # in battle, no menu up (animations)
+    BATTLE_MESSAGE = 'battle_message'
+    ACTION_MENU = 'action_menu'  # FIGHT / BAG / POKEMON / RUN
+    MOVE_MENU = 'move_menu'
+
+    IN_BATTLE = (BATTLE, BATTLE_MESSAGE, ACTION_MENU, MOVE_MENU)
+
+
+class BattleHandler:
+    """Detects wild battles after fishing and plays them out with the configured policy."""
+
+    # (column, row) of each entry in the 2x2 action menu
+    ACTION_SLOTS = {
+        'fight': (0, 0),
+        'bag': (1, 0),
+        'pokemon': (0, 1),
+        'run': (1, 1),
+    }
+
+    def __init__(self, action_handler: ActionHandler, screen: ScreenCapture,
+                 sprite_index: Optional[SpriteIndex] = None):
+        self.logger = setup_logger()
+        self.action_handler = action_handler
+        self.screen = screen
+        self.sprite_index = sprite_index
+
+        # Detectors only capture the regions they look at
+        self.roi = RoiPlanner(screen)
+        for name in BATTLE_SETTINGS['colors']:
+            self.roi.register(name, BATTLE_SETTINGS['regions'][name])
+        self.scheduler = DetectionScheduler(self.roi)
+
+        # Called with the species and the window frame it was identified in (e.g. to save a snapshot)
+        self.on_target_species: Optional[Callable[[str, np.ndarray], None]] = None
+        # Called whenever the battle moves on (it starts or a new turn begins), e.g. to re-arm the watchdog
+        self.on_progress: Optional[Callable[[], None]] = None
+
+        # Encounter statistics
+        self.attempts = 0
+        self.casts_seen = 0
+        self.encounters = 0
+        self.phase_totals: Dict[str, float] = {}
+        self.started_at = None
+
+    def detect_state(self, regions: Optional[Dict[str, np.ndarray]] = None) -> str:
+        """
+        Work out the current screen state from the captured detector regions.
+
+        Only the regions that are present are checked, so with fewer active
+        regions the result is less specific (e.g. BATTLE instead of ACTION_MENU).
+
+        Args:
+            regions: Region name to image, captured with the ROI planner if not given
+
+        Returns:
+            One of the BattleState values
+        """
+        if regions is None:
+            regions = self.roi.capture()
+
+        with tracer.span('detect_state', 'detection'):
+            return self._classify(regions)
+
+    def _classify(self, regions: Dict[str, np.ndarray]) -> str:
+        """Map the captured regions to a BattleState (see detect_state())."""
+        # Transitions black out the whole window, so every captured region is black
+        if all(image.mean() < BATTLE_SETTINGS['black_threshold'] for image in regions.values()):
+            return BattleState.TRANSITION
+
+        if self._region_matches(regions, 'enemy_hp_box'):
+            if self._region_matches(regions, 'action_menu'):
+                return BattleState.ACTION_MENU
+            if self._region_matches(regions, 'move_menu'):
+                return BattleState.MOVE_MENU
+            if self._region_matches(regions, 'message_box'):
+                return BattleState.BATTLE_MESSAGE
+            return BattleState.BATTLE
+
+        if self._region_matches(regions, 'message_box'):
+            return BattleState.MESSAGE
+        return BattleState.OVERWORLD
+
+    def _region_matches(self, regions: Dict[str, np.ndarray], region_name: str) -> bool:
+        """Check whether a captured region shows its reference color."""
+        image = regions.get(region_name)
+        if image is None:
+            return False
+        distance = self.screen.color_distance(self.screen.mean_color(image), BATTLE_SETTINGS['colors'][region_name])
+        return distance <= BATTLE_SETTINGS['color_tolerance']
+
+    @staticmethod
+    def _regions_for(states: set, advance_messages: bool) -> set:
+        """Pick the detector regions needed to recognise the given states."""
+        # The HP box alone tells battle from overworld
+        regions = {'enemy_hp_box'}
+        if advance_messages or {BattleState.MESSAGE, BattleState.BATTLE_MESSAGE, BattleState.OVERWORLD} & states:
+            regions.add('message_box')
+
+        # Menus only matter when the caller needs more than "in battle"
+        if BattleState.BATTLE not in states:
+            if BattleState.ACTION_MENU in states:
+                regions.add('action_menu')
+            if BattleState.MOVE_MENU in states:
+                regions.add('move_menu')
+        return regions
+
+    async def wait_for_state(self, states: Iterable[str], timeout: float, advance_messages: bool = False,
+                             seen: Optional[set] = None, profile: Optional[str] = None) -> Optional[str]:
+        """
+        Poll the screen until one of the given states shows up.
+
+        Args:
+            states: States to wait for
+            timeout: Seconds to wait before giving up
+            advance_messages: Press the confirm key whenever a message box is up
+            seen: If given, every detected state is added to it
+            profile: Detection rate profile (see DETECTION_SETTINGS['profiles'])
+
+        Returns:
+            The state that was reached, or None on timeout
+        """
+        states = set(states)
+        self.scheduler.configure(self._regions_for(states, advance_messages), profile)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        with tracer.span('wait_for_state', 'wait', states=sorted(states)):
+            return await self._poll(states, deadline, advance_messages, seen)
+
+    async def _poll(self, states: set, deadline: float, advance_messages: bool, seen: Optional[set]) -> Optional[str]:
+        """Polling loop of wait_for_state()."""
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            state = self.detect_state(self.scheduler.poll(loop.time()))
+            if seen is not None:
+                seen.add(state)
+            if state in states:
+                return state
+
+            if advance_messages and state in (BattleState.MESSAGE, BattleState.BATTLE_MESSAGE):
+                await self.action_handler.press_key(BATTLE_SETTINGS['confirm_key'])
+                # The kept images show the screen before the key press
+                self.scheduler.invalidate()
+                await asyncio.sleep(BOT_SETTINGS['action_delay'])
+
+            await asyncio.sleep(self.scheduler.delay(loop.time()))
+
+        return None
+
+    @traced('action', 'battle')
+    async def handle_encounter(self) -> Dict[str, Any]:
+        """
+        Wait for a wild battle after fishing and play it out.
+
+        Returns:
+            Dict with 'encountered', 'cast_seen', 'outcome', 'turns' and per-phase 'timings' in seconds
+        """
+        loop = asyncio.get_running_loop()
+        if self.started_at is None:
+            self.started_at = loop.time()
+
+        result = {
+            'encountered': False,
+            'cast_seen': False,
+            'outcome': 'no_encounter',
+            'species': None,
+            'species_confidence': 0.0,
+            'turns': 0,
+            'timings': {},
+        }
+        timings = result['timings']
+
+        # Phase 1: wait for the bite and the battle to start
+        phase_start = loop.time()
+        seen = set()
+        state = await self.wait_for_state(
+            BattleState.IN_BATTLE, BATTLE_SETTINGS['entry_timeout'], advance_messages=True, seen=seen, profile='bite'
+        )
+        timings['entry'] = loop.time() - phase_start
+
+        # A fishing message or a battle on screen means the cast worked
+        self.attempts += 1
+        result['cast_seen'] = state is not None or BattleState.MESSAGE in seen
+        if result['cast_seen']:
+            self.casts_seen += 1
+
+        if state is None:
+            self.logger.info("🎣 No encounter this cycle")
+            self._record_timings(timings)
+            return result
+
+        result['encountered'] = True
+        self.encounters += 1
+        self._progress()
+        self.logger.info(f"⚔️ Wild battle detected (encounter #{self.encounters})")
+
+        # Phase 2: play turns until the battle ends
+        phase_start = loop.time()
+        try:
+            result['outcome'] = await self._play_battle(result)
+        finally:
+            timings['battle'] = loop.time() - phase_start
+
+        # Phase 3: wait until we are back in the overworld
+        phase_start = loop.time()
+        exited = await self.wait_for_state(
+            [BattleState.OVERWORLD], BATTLE_SETTINGS['exit_timeout'], advance_messages=True, profile='exit'
+        )
+        timings['exit'] = loop.time() - phase_start
+
+        if exited is None:
+            self.logger.warning("⚠️ Battle exit not detected before timeout")
+            result['outcome'] = 'exit_timeout'
+
+        self._record_timings(timings)
+        self.logger.info(
+            f"✅ Battle finished: {result['outcome']} ({result['species'] or 'unknown'}) after {result['turns']} turn(s) "
+            f"(entry {timings['entry']:.2f}s, battle {timings['battle']:.2f}s, exit {timings['exit']:.2f}s)"
+        )
+        return result
+
+    async def _play_battle(self, result: Dict[str, Any]) -> str:
+        """Execute the policy turn by turn until the battle is over."""
+        policy = BATTLE_SETTINGS['policy']
+        max_turns = BATTLE_SETTINGS['max_turns']
+
+        # After max_turns the policy gives up and the remaining turns try to run
+        for turn in range(2 * max_turns):
+            state = await self.wait_for_state(
+                [BattleState.ACTION_MENU, BattleState.OVERWORLD],
+                BATTLE_SETTINGS['turn_timeout'],
+                advance_messages=True,
+                profile='turn',
+            )
+            if state == BattleState.OVERWORLD:
+                return 'finished'
+            if state is None:
+                self.logger.warning("⚠️ Action menu not detected before timeout")
+                return 'turn_timeout'
+            self._progress()
+
+            # The sprite has settled once the first action menu shows up
+            if turn == 0:
+                policy = self._identify_species(result)
+            elif turn == max_turns and policy != 'run':
+                self.logger.warning(f"⚠️ Battle still running after {max_turns} turns, running away")
+                policy = 'run'
+
+            result['turns'] += 1
+            self.logger.debug(f"Turn {result['turns']}: executing '{policy}' policy")
+
+            if policy == 'run':
+                await self._select_action_slot('run')
+            elif policy == 'fight':
+                await self._fight(BATTLE_SETTINGS['move_index'])
+            elif policy == 'catch':
+                await self._catch()
+            else:
+                raise ValueError(f"Unknown battle policy: {policy}")
+
+        self.logger.warning(f"⚠️ Could not leave the battle after {2 * max_turns} turns")
+        return 'max_turns'
+
+    def _progress(self):
+        """Tell on_progress that the battle moved on."""
+        if self.on_progress:
+            self.on_progress()
+
+    def _identify_species(self, result: Dict[str, Any]) -> str:
+        """Identify the wild Pokémon and pick the policy for it."""
+        policy = BATTLE_SETTINGS['policy']
+        if self.sprite_index is None:
+            return policy
+
+        # The whole window, so a target species can be saved as it looked
+        with tracer.span('capture_sprite', 'capture'):
+            frame = self.screen.grab()
+        sprite = self.screen.crop_relative(frame, BATTLE_SETTINGS['regions']['enemy_sprite'])
+        with tracer.span('identify_species', 'detection'):
+            species, confidence = self.sprite_index.identify(sprite)
+        result['species'] = species
+        result['species_confidence'] = confidence
+
+        if species is None:
+            self.logger.info(f"❓ Unknown species (best confidence {confidence:.2f})")
+            return policy
+
+        self.logger.info(f"🔎 Identified {species} (confidence {confidence:.2f})")
+        if species in BATTLE_SETTINGS['target_species']:
+            self.logger.warning(f"🚨 Target species encountered: {species}!")
+            if self.on_target_species:
+                self.on_target_species(species, frame)
+
+        return BATTLE_SETTINGS['species_policies'].get(species, policy)
+
+    async def _select_slot(self, column: int, row: int):
+        """Move the cursor of a 2x2 menu to a slot and confirm it."""
+        # Reset the cursor to the top-left slot first, menus remember the last position
+        await self.action_handler.press_key('up')
+        await self.action_handler.press_key('left')
+        if column:
+            await self.action_handler.press_key('right')
+        if row:
+            await self.action_handler.press_key('down')
+        await self.action_handler.press_key(BATTLE_SETTINGS['confirm_key'])
+
+    async def _select_action_slot(self, action: str):
+        """Pick an entry of the action menu."""
+        column, row = self.ACTION_SLOTS[action]
+        await self._select_slot(column, row)
+
+    async def _fight(self, move_index: int):
+        """Open the move menu and use the move in the given slot (1-4)."""
+        await self._select_action_slot('fight')
+        state = await self.wait_for_state([BattleState.MOVE_MENU], BATTLE_SETTINGS['turn_timeout'], profile='move_menu')
+        if state is None:
+            self.logger.warning("⚠️ Move menu not detected, skipping turn")
+            return
+
+        slot = move_index - 1
+        await self._select_slot(slot % 2, slot // 2)
+
+    async def _catch(self):
+        """Throw a ball using the configured key sequence."""
+        await self.action_handler.press_key('up')
+        await self.action_handler.press_key('left')
+        for key in BATTLE_SETTINGS['catch_sequence']:
+            await self.action_handler.press_key(key)
+            await asyncio.sleep(BOT_SETTINGS['action_delay'])
+
+    def _record_timings(self, timings: Dict[str, float]):
+        """Add the phase timings of one encounter to the running totals."""
+        for phase, duration in timings.items():
+            self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + duration
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get encounter statistics.
+
+        Returns:
+            Dict with cast and encounter counts, encounters per hour, total seconds per phase and capture statistics
+        """
+        encounters_per_hour = 0.0
+        if self.started_at is not None:
+            elapsed = asyncio.get_running_loop().time() - self.started_at
+            if elapsed > 0:
+                encounters_per_hour = self.encounters * 3600 / elapsed
+
+        return {
+            'attempts': self.attempts,
+            'casts_seen': self.casts_seen,
+            'encounters': self.encounters,
+            'encounters_per_hour': encounters_per_hour,
+            'phase_totals': dict(self.phase_totals),
+            'capture': {**self.roi.get_stats(), **self.scheduler.get_stats()},
+        }
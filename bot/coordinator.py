@@ -1,23 +1,73 @@
 import asyncio
-import pyautogui
+import time
+import numpy as np
 from typing import Dict, Callable, Optional
-from bot.calibrator import ScreenCalibrator
 from bot.actions import ActionHandler
-from bot.process_manager import ProcessManager
-from config.settings import BOT_SETTINGS, CYCLE_SETTINGS
+from bot.battle import BattleHandler
+from bot.emergency_stop import EmergencyStop
+from bot.errors import RECOVERABLE_ERRORS
+from bot.input_backend import create_input_backend
+from bot.screen import ScreenCapture
+from bot.snapshots import FrameRing, SnapshotArchiver
+from bot.sprites import SpriteIndex
+from bot.watchdog import Watchdog
+from config.settings import BOT_SETTINGS, CYCLE_SETTINGS, SPRITE_SETTINGS, WATCHDOG_SETTINGS
 from utils.logger import setup_logger
+from utils.memory import MemoryMonitor
+from utils.profiler import profiler
+from utils.store import EventStore
+from utils.tracing import tracer
 
 
 class BotCoordinator:
     """Coordinates the bot's main action cycle and manages different components."""
     
-    def __init__(self):
+    def __init__(self, process_manager=None, calibrator=None, screen: Optional[ScreenCapture] = None,
+                 input_backend=None, store: Optional[EventStore] = None,
+                 sprite_index: Optional[SpriteIndex] = None):
+        """
+        Create the coordinator and its components.
+        
+        Args:
+            process_manager: Process/window manager, a Windows ProcessManager by default
+            calibrator: Screen calibrator, a ScreenCalibrator by default
+            screen: Frame source, a pyautogui-backed ScreenCapture by default
+            input_backend: Keyboard/mouse backend, the one selected by INPUT_SETTINGS['backend'] by default
+            store: Event store, the configured SQLite store by default
+            sprite_index: Prebuilt sprite index, loaded from SPRITE_SETTINGS['index_path'] by default
+        """
         self.logger = setup_logger()
-        self.process_manager = ProcessManager()
-        self.calibrator = ScreenCalibrator()
-        self.action_handler = ActionHandler()
+        
+        # The real components need Windows and a display, so they are only
+        # imported when nothing is injected (e.g. by the simulator)
+        if process_manager is None:
+            from bot.process_manager import ProcessManager
+            process_manager = ProcessManager()
+        if calibrator is None:
+            from bot.calibrator import ScreenCalibrator
+            calibrator = ScreenCalibrator()
+        
+        self.process_manager = process_manager
+        self.calibrator = calibrator
+        self.action_handler = ActionHandler(input_backend or create_input_backend(self.process_manager))
+        self.screen = screen or ScreenCapture()
+        self.sprite_index = sprite_index or SpriteIndex()
+        self.battle_handler = BattleHandler(self.action_handler, self.screen, self.sprite_index)
+        self.battle_handler.on_target_species = self._on_target_species
+        self.battle_handler.on_progress = self._on_battle_progress
+        self.store = store or EventStore()
+        self.frames = FrameRing()
+        self.watchdog = Watchdog(self.process_manager, self.calibrator, self.screen, self.action_handler, self.store,
+                                 frames=self.frames)
+        self.watchdog.on_failure = self._on_watchdog_failure
+        self.archiver = SnapshotArchiver(self.frames)
+        self.memory = MemoryMonitor(self.store)
+        self.profiler = profiler
+        self.emergency_stop = EmergencyStop(self._on_emergency_stop)
         self.is_running = False
         self.current_cycle = 0
+        self._cycle_task = None
+        self._main_task = None
         
     async def start(self):
         """Start the bot coordinator."""
@@ -39,13 +89,46 @@ class BotCoordinator:
             window_region = self.process_manager.get_window_region()
             if window_region:
                 self.action_handler.set_window_region(window_region)
+                self.screen.set_window_region(window_region)
             else:
                 self.logger.warning("⚠️ Could not get window region, actions may not be targeted correctly")
             
-            # Step 4: Start main action cycle
-            self.logger.info("Step 4: Starting main action cycle...")
+            # Step 4: Load the sprite index for species identification
+            self.logger.info("Step 4: Loading sprite index...")
+            if not self.sprite_index.names:
+                self.sprite_index.load(SPRITE_SETTINGS['index_path'])
+            
+            # Step 5: Open the event store
+            self.logger.info("Step 5: Opening event store...")
+            self.store.open()
+            
+            # Step 6: Start the watchdog
+            self.logger.info("Step 6: Starting watchdog...")
+            self.watchdog.start()
+            
+            # Step 7: Start memory instrumentation and the snapshot archiver
+            self.logger.info("Step 7: Starting memory monitor and snapshot archiver...")
+            self.memory.start()
+            self.archiver.start()
+            
+            # Step 8: Listen for profiling requests
+            self.logger.info("Step 8: Installing profiler triggers...")
+            await self.profiler.install()
+            
+            # Step 9: Arm the emergency stop hotkey
+            self.logger.info("Step 9: Arming emergency stop...")
+            self.emergency_stop.start()
+            
+            # Step 10: Start main action cycle as a task the emergency stop can cancel
+            self.logger.info("Step 10: Starting main action cycle...")
             self.is_running = True
-            await self._run_main_cycle()
+            self._main_task = asyncio.ensure_future(self._run_main_cycle())
+            self._main_task.set_name('main')
+            try:
+                await self._main_task
+            except asyncio.CancelledError:
+                if not self.emergency_stop.triggered:
+                    raise
             
         except Exception as e:
             self.logger.error(f"Bot coordinator failed: {e}")
@@ -62,14 +145,37 @@ class BotCoordinator:
         
         try:
             while self.is_running:
+                # Hold off while the watchdog brings the client back
+                await self.watchdog.wait_healthy()
+                if self.watchdog.gave_up:
+                    raise RuntimeError("Watchdog could not recover PokéMMO")
+                
                 self.current_cycle += 1
+                self.profiler.tag(cycle=self.current_cycle)
                 self.logger.info(f"Starting cycle #{self.current_cycle}")
                 
-                # Execute the action sequence
-                await self._execute_action_sequence()
+                # Execute the action sequence as a task so the watchdog can cancel it
+                self._cycle_task = asyncio.ensure_future(self._run_cycle())
+                self._cycle_task.set_name('cycle')
+                self.watchdog.expect('cycle', WATCHDOG_SETTINGS['cycle_timeout'])
+                try:
+                    await self._cycle_task
+                except asyncio.CancelledError:
+                    # Only swallow the cancellation if it came from the watchdog
+                    if not self.watchdog.recovering or self.emergency_stop.triggered:
+                        raise
+                    self.logger.warning(f"⚠️ Cycle #{self.current_cycle} cancelled by watchdog")
+                except RECOVERABLE_ERRORS as e:
+                    # Client or environment trouble; anything else is a bug and stops the bot
+                    self.watchdog.report_failure(f"cycle #{self.current_cycle} failed: {e}")
+                finally:
+                    self.watchdog.fulfil('cycle')
+                    self._cycle_task = None
+                    self.profiler.tag(step=None)
                 
                 # Wait before next cycle
-                await asyncio.sleep(CYCLE_SETTINGS['cycle_delay'])
+                with tracer.span('cycle_delay', 'wait'):
+                    await asyncio.sleep(CYCLE_SETTINGS['cycle_delay'])
                 
         except KeyboardInterrupt:
             self.logger.info("Main cycle interrupted by user")
@@ -78,26 +184,110 @@ class BotCoordinator:
             raise
         finally:
             self.is_running = False
+            self.action_handler.release_all_keys()
+            if self.emergency_stop.triggered:
+                latency = self.emergency_stop.latency()
+                self.logger.warning(f"🛑 Bot stopped {latency * 1000:.1f} ms after the emergency stop")
+                self.store.record_metric('emergency_stop.latency_ms', latency * 1000)
+            self.emergency_stop.stop()
+            await self.watchdog.stop()
+            await self.memory.stop()
+            await self.profiler.uninstall()
+            self.archiver.stop()
+            if tracer.enabled:
+                tracer.export()
+            self.store.close()
+    
+    def _on_emergency_stop(self):
+        """Cancel whatever the bot is doing, then release all keys."""
+        self.is_running = False
+        if self._main_task is not None and not self._main_task.done():
+            self._main_task.cancel()
+        self.action_handler.release_all_keys()
+    
+    def _on_watchdog_failure(self, reason: str):
+        """Save what the screen showed and cancel the running cycle when the watchdog detects a problem."""
+        self.archiver.snapshot('watchdog')
+        if self._cycle_task is not None and not self._cycle_task.done():
+            self._cycle_task.cancel()
     
-    async def _execute_action_sequence(self):
-        """Execute the sequence of actions for one cycle."""
+    def _on_battle_progress(self):
+        """Give the cycle a fresh deadline, a long battle that keeps playing turns is not stuck."""
+        self.watchdog.expect('cycle', WATCHDOG_SETTINGS['cycle_timeout'])
+    
+    def _on_target_species(self, species: str, frame: np.ndarray):
+        """Save the battle frame the species was identified in, after the frames leading up to it."""
+        self.frames.push(frame)
+        self.archiver.snapshot(f'target-{species}')
+    
+    async def _run_cycle(self):
+        """Execute one cycle and record its outcome in the event store."""
+        loop = asyncio.get_running_loop()
+        started_at = time.time()
+        cycle_start = loop.time()
+        encounter = None
+        error = None
+        
+        try:
+            with tracer.span('cycle', 'cycle', cycle=self.current_cycle):
+                encounter = await self._execute_action_sequence()
+        except asyncio.CancelledError:
+            error = 'cancelled'
+            self.store.record_failure(self.current_cycle, 'Cancelled', error)
+            raise
+        except Exception as e:
+            error = str(e)
+            self.store.record_failure(self.current_cycle, type(e).__name__, error)
+            self.archiver.snapshot('cycle-failed')
+            raise
+        finally:
+            encountered = bool(encounter and encounter['encountered'])
+            if encountered:
+                self.store.record_encounter(self.current_cycle, encounter)
+            self.store.record_cycle(
+                self.current_cycle, started_at, loop.time() - cycle_start,
+                success=error is None, encountered=encountered, error=error,
+            )
+    
+    async def _execute_action_sequence(self) -> Dict:
+        """
+        Execute the sequence of actions for one cycle.
+        
+        Returns:
+            The encounter result from the battle handler
+        """
         
         try:
             # Action 1: Teleport
             self.logger.info("Executing teleport action...")
+            self.profiler.tag(step='teleport')
             await self.action_handler.teleport()
             
             # Action 2: Walking to beach
             self.logger.info("Executing walking to beach action...")
+            self.profiler.tag(step='walking_to_beach')
             await self.action_handler.walking_to_beach()
             
             # Action 3: Fish
             self.logger.info("Executing fish action...")
+            self.profiler.tag(step='fish')
             await self.action_handler.fish()
             
+            # Action 4: Handle the wild battle if something bit
+            self.logger.info("Waiting for encounter...")
+            self.profiler.tag(step='battle')
+            encounter = await self.battle_handler.handle_encounter()
+            
+            stats = self.battle_handler.get_stats()
+            self.logger.info(
+                f"📈 Encounters: {stats['encounters']} ({stats['encounters_per_hour']:.1f}/h)"
+            )
+            
             # Future actions can be added here:
             # await self.action_handler.some_other_action()
             
+            return encounter
+            
         except Exception as e:
             self.logger.error(f"Action sequence failed: {e}")
             # Depending on requirements, we could retry or continue
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Callable, Optional
+from config.settings import CYCLE_SETTINGS
+from utils.logger import setup_logger
+
+
+class EmergencyStop:
+    """
+    Global hotkey that stops the bot immediately.
+
+    The pynput listener runs in its own thread, so the hotkey works even while
+    the event loop is busy. A press is handed to the loop with
+    call_soon_threadsafe(), which wakes it right away to run on_stop.
+    """
+
+    def __init__(self, on_stop: Callable[[], None]):
+        self.logger = setup_logger()
+        self.on_stop = on_stop
+        self.hotkey = CYCLE_SETTINGS['emergency_stop_key']
+
+        # perf_counter() of the hotkey press, seen from the listener thread
+        self.triggered_at: Optional[float] = None
+        self._loop = None
+        self._listener = None
+
+    @property
+    def triggered(self) -> bool:
+        return self.triggered_at is not None
+
+    def start(self):
+        """Start listening for the hotkey."""
+        # trigger() works without the hotkey, e.g. in the simulator
+        self._loop = asyncio.get_running_loop()
+        if not self.hotkey:
+            self.logger.debug("No emergency stop key configured")
+            return
+
+        # Imported here so headless runs (simulator, CI) never need a display
+        from pynput import keyboard
+
+        self._listener = keyboard.GlobalHotKeys({self.to_pynput(self.hotkey): self._on_hotkey})
+        self._listener.daemon = True
+        self._listener.start()
+        self.logger.info(f"🛑 Emergency stop armed: {self.hotkey}")
+
+    def stop(self):
+        """Stop the listener thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def trigger(self):
+        """Stop the bot as if the hotkey was pressed (safe to call from any thread)."""
+        self._on_hotkey()
+
+    def latency(self) -> Optional[float]:
+        """Seconds since the hotkey was pressed, None if it was not."""
+        return time.perf_counter() - self.triggered_at if self.triggered else None
+
+    def _on_hotkey(self):
+        """Listener thread: hand the stop to the event loop."""
+        if self.triggered or self._loop is None:
+            return
+        self.triggered_at = time.perf_counter()
+        self._loop.call_soon_threadsafe(self._stop_now)
+
+    def _stop_now(self):
+        self.logger.warning("🛑 Emergency stop pressed!")
+        self.on_stop()
+
+    @staticmethod
+    def to_pynput(hotkey: str) -> str:
+        """Convert a hotkey like 'ctrl+alt+q' to pynput's '<ctrl>+<alt>+q' format."""
+        keys = [key.strip().lower() for key in hotkey.split('+')]
+        return '+'.join(key if len(key) == 1 else f'<{key}>' for key in keys)
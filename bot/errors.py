@@ -0,0 +1,11 @@
+class ClientError(RuntimeError):
+    """
+    The game client or its environment failed: screen capture, input delivery or the window went away.
+
+    The watchdog recovers from these (refocus, relaunch, ...). Any other
+    exception in a cycle is a bug or a configuration mistake and stops the bot.
+    """
+
+
+# Exceptions in a cycle that start a watchdog recovery instead of stopping the bot
+RECOVERABLE_ERRORS = (ClientError, OSError)
@@ -0,0 +1,356 @@
+import platform
+from typing import Callable, Optional
+from bot.errors import ClientError
+from config.settings import BOT_SETTINGS, INPUT_SETTINGS, SCREEN_SETTINGS
+from utils.logger import setup_logger
+
+
+class PyAutoGuiInput:
+    """Sends keyboard and mouse input to the focused window through pyautogui."""
+
+    def __init__(self):
+        # Imported here so headless runs (simulator, CI) never need a display
+        import pyautogui
+
+        self.logger = setup_logger()
+        self.pyautogui = pyautogui
+
+        # Disable pyautogui failsafe for automation
+        pyautogui.FAILSAFE = False
+
+        # Set default delays
+        pyautogui.PAUSE = BOT_SETTINGS.get('action_delay', 0.1)
+
+    def key_down(self, key: str):
+        """Press and hold a key."""
+        self.pyautogui.keyDown(key)
+
+    def key_up(self, key: str):
+        """Release a held key, skipping pyautogui.PAUSE so stopping never blocks the loop."""
+        self.pyautogui.keyUp(key, _pause=False)
+
+    def press(self, key: str):
+        """Press and release a key."""
+        self.pyautogui.press(key)
+
+    def click(self, x: int, y: int, button: str = 'left', clicks: int = 1):
+        """Click at a screen position."""
+        self.pyautogui.click(x, y, clicks=clicks, button=button)
+
+
+class PostMessageInput:
+    """
+    Posts keyboard and mouse messages straight to the game window (Windows).
+
+    The window does not need focus, so no focus calls or focus sleeps are
+    needed and the machine stays usable while the bot runs.
+    """
+
+    # Keys whose scan codes need the extended-key flag
+    EXTENDED_KEYS = {'left', 'up', 'right', 'down', 'insert', 'delete', 'home', 'end', 'pageup', 'pagedown'}
+
+    def __init__(self, window: Callable[[], Optional[int]]):
+        """
+        Args:
+            window: Returns the current window handle (it changes when the client is relaunched)
+        """
+        import pywintypes
+        import win32api
+        import win32con
+        import win32gui
+
+        self.logger = setup_logger()
+        self.pywintypes = pywintypes
+        self.win32api = win32api
+        self.win32con = win32con
+        self.win32gui = win32gui
+        self.window = window
+
+        self.virtual_keys = {
+            'left': win32con.VK_LEFT,
+            'up': win32con.VK_UP,
+            'right': win32con.VK_RIGHT,
+            'down': win32con.VK_DOWN,
+            'enter': win32con.VK_RETURN,
+            'return': win32con.VK_RETURN,
+            'space': win32con.VK_SPACE,
+            'esc': win32con.VK_ESCAPE,
+            'escape': win32con.VK_ESCAPE,
+            'tab': win32con.VK_TAB,
+            'backspace': win32con.VK_BACK,
+            'shift': win32con.VK_SHIFT,
+            'ctrl': win32con.VK_CONTROL,
+            'alt': win32con.VK_MENU,
+            'insert': win32con.VK_INSERT,
+            'delete': win32con.VK_DELETE,
+            'home': win32con.VK_HOME,
+            'end': win32con.VK_END,
+            'pageup': win32con.VK_PRIOR,
+            'pagedown': win32con.VK_NEXT,
+        }
+
+    def key_down(self, key: str):
+        """Press and hold a key."""
+        vk = self._virtual_key(key)
+        self._post(self._hwnd(), self.win32con.WM_KEYDOWN, vk, self._lparam(key, vk, up=False))
+
+    def key_up(self, key: str):
+        """Release a held key."""
+        vk = self._virtual_key(key)
+        self._post(self._hwnd(), self.win32con.WM_KEYUP, vk, self._lparam(key, vk, up=True))
+
+    def press(self, key: str):
+        """Press and release a key."""
+        self.key_down(key)
+        self.key_up(key)
+
+    def click(self, x: int, y: int, button: str = 'left', clicks: int = 1):
+        """Click at a screen position inside the window."""
+        messages = {
+            'left': (self.win32con.WM_LBUTTONDOWN, self.win32con.WM_LBUTTONUP, self.win32con.MK_LBUTTON),
+            'right': (self.win32con.WM_RBUTTONDOWN, self.win32con.WM_RBUTTONUP, self.win32con.MK_RBUTTON),
+            'middle': (self.win32con.WM_MBUTTONDOWN, self.win32con.WM_MBUTTONUP, self.win32con.MK_MBUTTON),
+        }
+        down, up, flag = messages[button]
+
+        hwnd = self._hwnd()
+        try:
+            client_x, client_y = self.win32gui.ScreenToClient(hwnd, (x, y))
+        except self.pywintypes.error as e:
+            raise ClientError(f"PokéMMO window is gone: {e}") from e
+        position = self.win32api.MAKELONG(client_x, client_y)
+        for _ in range(clicks):
+            self._post(hwnd, down, flag, position)
+            self._post(hwnd, up, 0, position)
+
+    def _hwnd(self) -> int:
+        hwnd = self.window()
+        if not hwnd:
+            raise ClientError("No PokéMMO window handle for background input")
+        return hwnd
+
+    def _post(self, hwnd: int, message: int, wparam: int, lparam: int):
+        try:
+            self.win32api.PostMessage(hwnd, message, wparam, lparam)
+        except self.pywintypes.error as e:
+            raise ClientError(f"PostMessage to the PokéMMO window failed: {e}") from e
+
+    def _virtual_key(self, key: str) -> int:
+        key = key.lower()
+        if key in self.virtual_keys:
+            return self.virtual_keys[key]
+        if len(key) == 1:
+            return self.win32api.VkKeyScan(key) & 0xff
+        raise ValueError(f"Unsupported key for background input: {key}")
+
+    def _lparam(self, key: str, vk: int, up: bool) -> int:
+        """Repeat count, scan code and flags as a real keyboard would send them."""
+        lparam = 1 | (self.win32api.MapVirtualKey(vk, 0) << 16)
+        if key.lower() in self.EXTENDED_KEYS:
+            lparam |= 1 << 24
+        if up:
+            # Previous key state and transition state
+            lparam |= (1 << 30) | (1 << 31)
+        return lparam
+
+
+class X11Input:
+    """
+    Sends keyboard and mouse input to the game window on X11 (also under Xvfb).
+
+    With the 'send_event' method, events are delivered to the window with
+    XSendEvent and focus never changes. Some toolkits ignore such synthetic
+    events; the 'xtest' method instead injects real events through XTEST, which
+    go to the focused window, so it moves the X input focus to the game window
+    (without raising it) before every key event. That is a focus change: it
+    takes keyboard input away from whatever you are using, and with several
+    clients on one display their key events race for the focus. Use xtest only
+    for a single client on a display of its own (e.g. Xvfb).
+    """
+
+    # pyautogui key names that differ from X keysym names
+    KEYSYMS = {
+        'left': 'Left',
+        'up': 'Up',
+        'right': 'Right',
+        'down': 'Down',
+        'enter': 'Return',
+        'return': 'Return',
+        'esc': 'Escape',
+        'escape': 'Escape',
+        'tab': 'Tab',
+        'backspace': 'BackSpace',
+        'shift': 'Shift_L',
+        'ctrl': 'Control_L',
+        'alt': 'Alt_L',
+        'delete': 'Delete',
+        'home': 'Home',
+        'end': 'End',
+        'pageup': 'Prior',
+        'pagedown': 'Next',
+    }
+    BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+
+    def __init__(self, method: Optional[str] = None, window_title: Optional[str] = None,
+                 display_name: Optional[str] = None):
+        # Imported here so Windows installs never need python-xlib
+        from Xlib import X, XK, display, error
+        from Xlib.ext import xtest
+        from Xlib.protocol import event
+
+        self.logger = setup_logger()
+        self.X, self.XK, self.error, self.xtest, self.event = X, XK, error, xtest, event
+
+        self.method = method or INPUT_SETTINGS['x11_method']
+        if self.method not in ('send_event', 'xtest'):
+            raise ValueError(f"Unknown X11 input method: {self.method}")
+
+        self.display = display.Display(display_name)
+        self.root = self.display.screen().root
+        self.window_title = (window_title or SCREEN_SETTINGS['window_title']).lower()
+        self._window = None
+
+        if self.method == 'xtest' and not self.display.has_extension('XTEST'):
+            raise RuntimeError("The X server has no XTEST extension")
+
+    def key_down(self, key: str):
+        """Press and hold a key."""
+        self._key_event(key, press=True)
+
+    def key_up(self, key: str):
+        """Release a held key."""
+        self._key_event(key, press=False)
+
+    def press(self, key: str):
+        """Press and release a key."""
+        self.key_down(key)
+        self.key_up(key)
+
+    def click(self, x: int, y: int, button: str = 'left', clicks: int = 1):
+        """Click at a screen position inside the window."""
+        detail = self.BUTTONS[button]
+        for _ in range(clicks):
+            for press in (True, False):
+                self._deliver(lambda window: self._button_event(window, x, y, detail, press))
+
+    def _key_event(self, key: str, press: bool):
+        keycode = self._keycode(key)
+
+        def send(window):
+            if self.method == 'xtest':
+                self.display.set_input_focus(window, self.X.RevertToParent, self.X.CurrentTime)
+                self.xtest.fake_input(self.display, self.X.KeyPress if press else self.X.KeyRelease, keycode)
+                return
+            event_class = self.event.KeyPress if press else self.event.KeyRelease
+            self._send(window, event_class, keycode, 0, 0, self.X.KeyPressMask if press else self.X.KeyReleaseMask)
+
+        self._deliver(send)
+
+    def _button_event(self, window, x: int, y: int, detail: int, press: bool):
+        if self.method == 'xtest':
+            self.xtest.fake_input(self.display, self.X.MotionNotify, x=x, y=y)
+            self.xtest.fake_input(self.display, self.X.ButtonPress if press else self.X.ButtonRelease, detail)
+            return
+        position = window.translate_coords(self.root, x, y)
+        event_class = self.event.ButtonPress if press else self.event.ButtonRelease
+        mask = self.X.ButtonPressMask if press else self.X.ButtonReleaseMask
+        self._send(window, event_class, detail, position.x, position.y, mask, x, y)
+
+    def _send(self, window, event_class, detail: int, x: int, y: int, mask: int,
+              root_x: int = 0, root_y: int = 0):
+        """Deliver a synthetic key or button event to the window with XSendEvent."""
+        event = event_class(
+            time=self.X.CurrentTime,
+            root=self.root,
+            window=window,
+            child=self.X.NONE,
+            root_x=root_x,
+            root_y=root_y,
+            event_x=x,
+            event_y=y,
+            state=0,
+            same_screen=1,
+            detail=detail,
+        )
+        window.send_event(event, event_mask=mask, propagate=True)
+
+    def _deliver(self, send: Callable):
+        """Send to the game window, finding it again once if it went away (e.g. after a relaunch)."""
+        for attempt in range(2):
+            window = self._target()
+            try:
+                send(window)
+                # Round trip so errors about this window show up here
+                self.display.sync()
+                return
+            except self.error.BadWindow as e:
+                self._window = None
+                if attempt:
+                    raise ClientError(f"X11 window went away: {e}") from e
+            except (self.error.XError, self.error.ConnectionClosedError) as e:
+                raise ClientError(f"X11 input failed: {e}") from e
+
+    def _target(self):
+        if self._window is None:
+            self._window = self._find_window()
+            if self._window is None:
+                raise ClientError(f"No X11 window with '{self.window_title}' in its title")
+            self.logger.info(f"🪟 Sending X11 input to window 0x{self._window.id:x}")
+        return self._window
+
+    def _find_window(self):
+        """Find a top-level window whose title contains the configured window title."""
+        client_list = self.root.get_full_property(self.display.intern_atom('_NET_CLIENT_LIST'), self.X.AnyPropertyType)
+        if client_list:
+            windows = [self.display.create_resource_object('window', window_id) for window_id in client_list.value]
+        else:
+            # No window manager (e.g. bare Xvfb): look at the root's children
+            windows = self.root.query_tree().children
+
+        for window in windows:
+            try:
+                name = window.get_wm_name()
+            except self.error.XError:
+                continue
+            if isinstance(name, bytes):
+                name = name.decode(errors='replace')
+            if name and self.window_title in name.lower():
+                return window
+        return None
+
+    def _keycode(self, key: str) -> int:
+        keysym = self.XK.string_to_keysym(self.KEYSYMS.get(key.lower(), key))
+        keycode = self.display.keysym_to_keycode(keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"Unsupported key for X11 input: {key}")
+        return keycode
+
+
+def needs_focus() -> bool:
+    """True if the selected input backend types into the focused window, so the game window must have focus."""
+    return INPUT_SETTINGS['backend'] == 'pyautogui'
+
+
+def create_input_backend(process_manager=None):
+    """
+    Create the input backend selected by INPUT_SETTINGS['backend'].
+
+    Args:
+        process_manager: Provides the window handle for PostMessage input
+
+    Returns:
+        An input backend with key_down, key_up, press and click
+    """
+    backend = INPUT_SETTINGS['backend']
+    if backend == 'background':
+        backend = 'postmessage' if platform.system() == "Windows" else 'x11'
+
+    if backend == 'pyautogui':
+        return PyAutoGuiInput()
+    if backend == 'postmessage':
+        if process_manager is None:
+            raise ValueError("PostMessage input needs a process manager for the window handle")
+        return PostMessageInput(lambda: process_manager.pokemmo_window)
+    if backend == 'x11':
+        return X11Input()
+    raise ValueError(f"Unknown input backend: {backend}")
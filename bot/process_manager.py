@@ -1,7 +1,9 @@
 import psutil
+import subprocess
 import time
 import platform
 from typing import Optional, Tuple, Dict, Any
+from bot.input_backend import needs_focus
 from utils.logger import setup_logger
 
 # Windows-specific imports (will be imported only on Windows)
@@ -164,6 +166,26 @@ class ProcessManager:
             self.logger.error(f"❌ Error getting window info: {e}")
             return None
     
+    def restore_window(self) -> bool:
+        """
+        Restore the PokéMMO window if it is minimized, without activating or focusing it.
+
+        Returns:
+            bool: True if the window is (now) not minimized, False otherwise
+        """
+        if not self.pokemmo_window:
+            self.logger.error("❌ No PokéMMO window handle available")
+            return False
+
+        try:
+            if win32gui.IsIconic(self.pokemmo_window):
+                self.logger.info("🪟 Restoring minimized PokéMMO window...")
+                win32gui.ShowWindow(self.pokemmo_window, win32con.SW_SHOWNOACTIVATE)
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Error restoring window: {e}")
+            return False
+
     def focus_window(self) -> bool:
         """
         Focus on the PokéMMO window and bring it to foreground.
@@ -237,8 +259,8 @@ class ProcessManager:
                 "Could not get PokéMMO window information!"
             )
         
-        # Step 4: Focus the window
-        if not self.focus_window():
+        # Step 4: Focus the window (background input reaches it without focus)
+        if needs_focus() and not self.focus_window():
             self.logger.warning("⚠️ Could not focus PokéMMO window, but continuing...")
         
         self.logger.info("✅ PokéMMO is running and accessible!")
@@ -259,3 +281,50 @@ class ProcessManager:
         height = bottom - y
         
         return (x, y, width, height)
+    
+    def is_pokemmo_alive(self) -> bool:
+        """
+        Check whether the PokéMMO process found earlier is still running.
+        
+        Returns:
+            bool: True if the process exists and is not a zombie, False otherwise
+        """
+        if not self.pokemmo_process:
+            return False
+        
+        try:
+            return self.pokemmo_process.is_running() and self.pokemmo_process.status() != psutil.STATUS_ZOMBIE
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+    
+    def restart_pokemmo(self, command: str) -> bool:
+        """
+        Kill the current PokéMMO process (if any) and start a new one.
+        
+        Does not wait for the new client; look for its window afterwards.
+        
+        Args:
+            command: Command line that starts PokéMMO
+        
+        Returns:
+            bool: True if the new process was started, False otherwise
+        """
+        self.logger.info("🔁 Restarting PokéMMO...")
+        
+        if self.is_pokemmo_alive():
+            try:
+                self.pokemmo_process.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                self.logger.warning(f"⚠️ Could not kill old PokéMMO process: {e}")
+        
+        self.pokemmo_process = None
+        self.pokemmo_window = None
+        self.window_rect = None
+        
+        try:
+            subprocess.Popen(command, shell=True)
+            self.logger.info(f"✅ Started PokéMMO: {command}")
+            return True
+        except OSError as e:
+            self.logger.error(f"❌ Failed to start PokéMMO: {e}")
+            return False
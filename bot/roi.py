@@ -0,0 +1,216 @@
+import sys
+import time
+import numpy as np
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from bot.screen import ScreenCapture
+from config.settings import ROI_SETTINGS
+from utils.logger import setup_logger
+from utils.memory import BudgetedCache
+from utils.tracing import tracer
+
+
+Rect = Tuple[int, int, int, int]
+
+
+class RoiPlan:
+    """Rectangles to capture and where each detector's region sits inside them."""
+
+    def __init__(self, rects: List[Rect], views: Dict[str, Tuple[int, slice, slice]], window_pixels: int):
+        self.rects = rects
+        self.views = views
+        self.pixels = sum(w * h for _, _, w, h in rects)
+        self.window_pixels = window_pixels
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the plan: the object, its rectangles and its views (see utils.memory.sizeof)."""
+        total = sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+        total += sys.getsizeof(self.rects) + sum(sys.getsizeof(rect) for rect in self.rects)
+        total += sys.getsizeof(self.views)
+        for name, view in self.views.items():
+            total += sys.getsizeof(name) + sys.getsizeof(view) + sum(sys.getsizeof(part) for part in view)
+        return total
+
+    @property
+    def fraction(self) -> float:
+        """Share of the window the plan captures."""
+        return self.pixels / self.window_pixels if self.window_pixels else 0.0
+
+
+class RoiPlanner:
+    """
+    Captures only the screen regions the active detectors need.
+
+    Detectors register their regions (fractions of the window). If the screen
+    reads only the grabbed region (mss), the regions of the active detectors
+    are merged into a minimal set of rectangles, each grabbed once per frame.
+    Otherwise every grab reads the whole screen, so the plan is a single
+    rectangle around all regions. Every detector gets a zero-copy NumPy view
+    into its rectangle. Plans are cached per active set and window region.
+    """
+
+    def __init__(self, screen: ScreenCapture):
+        self.logger = setup_logger()
+        self.screen = screen
+        self.regions: Dict[str, Tuple[float, float, float, float]] = {}
+        self.active: FrozenSet[str] = frozenset()
+
+        self._plans = BudgetedCache('roi.plans')
+        self.frames = 0
+        # Bytes read from the screen (the whole screen per grab without region capture) and time spent grabbing
+        self.bytes_captured = 0
+        self.grab_seconds = 0.0
+
+    def register(self, name: str, relative_region: Tuple[float, float, float, float]):
+        """Declare the region a detector looks at."""
+        self.regions[name] = relative_region
+        self._plans.clear()
+
+    def set_active(self, names: Iterable[str]):
+        """Select the detectors whose regions are captured."""
+        names = frozenset(names)
+        unknown = names - self.regions.keys()
+        if unknown:
+            raise KeyError(f"Unknown ROI detector(s): {', '.join(sorted(unknown))}")
+        self.active = names
+
+    def plan(self) -> RoiPlan:
+        """Get the capture plan for the active detectors, computing it on first use."""
+        window_region = self.screen.window_region
+        key = (self.active, window_region)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._build_plan(window_region)
+            self._plans.put(key, plan)
+            self.logger.debug(
+                f"ROI plan for {sorted(self.active)}: {len(plan.rects)} rect(s), "
+                f"{plan.fraction:.1%} of the window"
+            )
+        return plan
+
+    def capture(self) -> Dict[str, np.ndarray]:
+        """
+        Grab the planned rectangles once.
+
+        Returns:
+            Detector name to a view of its region
+        """
+        plan = self.plan()
+        win_x, win_y = self._window_origin()
+
+        grabs = []
+        with tracer.span('capture', 'capture', rects=len(plan.rects)):
+            start = time.perf_counter()
+            for x, y, w, h in plan.rects:
+                region = (win_x + x, win_y + y, w, h)
+                grabs.append(self.screen.grab(region))
+                self.bytes_captured += self.screen.captured_pixels(region) * 3
+            self.grab_seconds += time.perf_counter() - start
+        self.frames += 1
+
+        return {
+            name: grabs[index][rows, cols]
+            for name, (index, rows, cols) in plan.views.items()
+        }
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get capture statistics.
+
+        Returns:
+            Dict with frames captured, average bytes read from the screen and milliseconds
+            spent grabbing per frame, and the share of the window in the current plan
+        """
+        plan = self.plan()
+        return {
+            'frames': self.frames,
+            'bytes_per_frame': self.bytes_captured / self.frames if self.frames else 0.0,
+            'grab_ms_per_frame': self.grab_seconds * 1000 / self.frames if self.frames else 0.0,
+            'window_fraction': plan.fraction,
+        }
+
+    def _window_origin(self) -> Tuple[int, int]:
+        window_region = self.screen.window_region
+        return (window_region[0], window_region[1]) if window_region else (0, 0)
+
+    def _window_size(self, window_region: Optional[Rect]) -> Tuple[int, int]:
+        if window_region:
+            return window_region[2], window_region[3]
+        x, y, w, h = self.screen.resolve_region((0.0, 0.0, 1.0, 1.0))
+        return w, h
+
+    def _build_plan(self, window_region: Optional[Rect]) -> RoiPlan:
+        """Resolve the active regions to pixels and merge them."""
+        win_w, win_h = self._window_size(window_region)
+
+        # Window-relative pixel rectangles, resolved the same way as ScreenCapture.crop_relative()
+        pixel_regions = {}
+        for name in sorted(self.active):
+            rel_x, rel_y, rel_w, rel_h = self.regions[name]
+            pixel_regions[name] = (
+                int(rel_x * win_w),
+                int(rel_y * win_h),
+                max(1, int(rel_w * win_w)),
+                max(1, int(rel_h * win_h)),
+            )
+
+        # Without region capture an extra grab costs a whole screen, so everything goes into one rectangle
+        overhead = ROI_SETTINGS['merge_overhead'] if self.screen.region_capture else float('inf')
+        rects = self.merge_rects(list(pixel_regions.values()), overhead)
+
+        views = {}
+        for name, (x, y, w, h) in pixel_regions.items():
+            index = next(i for i, rect in enumerate(rects) if self._contains(rect, (x, y, w, h)))
+            rect_x, rect_y = rects[index][:2]
+            views[name] = (index, slice(y - rect_y, y - rect_y + h), slice(x - rect_x, x - rect_x + w))
+
+        return RoiPlan(rects, views, win_w * win_h)
+
+    @classmethod
+    def merge_rects(cls, rects: List[Rect], overhead: int) -> List[Rect]:
+        """
+        Greedily merge rectangles while that lowers the capture cost.
+
+        The cost of a set of rectangles is their total area plus `overhead`
+        pixels per rectangle (the fixed cost of a separate grab). Rectangles
+        that contain each other are always merged.
+
+        Returns:
+            Merged rectangles covering all input rectangles
+        """
+        rects = list(dict.fromkeys(rects))
+
+        while len(rects) > 1:
+            best = None
+            for i in range(len(rects)):
+                for j in range(i + 1, len(rects)):
+                    union = cls._union(rects[i], rects[j])
+                    saving = cls._area(rects[i]) + cls._area(rects[j]) + overhead - cls._area(union)
+                    if saving >= 0 and (best is None or saving > best[0]):
+                        best = (saving, i, j, union)
+
+            if best is None:
+                break
+
+            _, i, j, union = best
+            rects = [rect for k, rect in enumerate(rects) if k not in (i, j)] + [union]
+
+        return rects
+
+    @staticmethod
+    def _area(rect: Rect) -> int:
+        return rect[2] * rect[3]
+
+    @staticmethod
+    def _union(a: Rect, b: Rect) -> Rect:
+        x = min(a[0], b[0])
+        y = min(a[1], b[1])
+        right = max(a[0] + a[2], b[0] + b[2])
+        bottom = max(a[1] + a[3], b[1] + b[3])
+        return (x, y, right - x, bottom - y)
+
+    @staticmethod
+    def _contains(outer: Rect, inner: Rect) -> bool:
+        return (outer[0] <= inner[0] and outer[1] <= inner[1]
+                and inner[0] + inner[2] <= outer[0] + outer[2]
+                and inner[1] + inner[3] <= outer[1] + outer[3])
@@ -0,0 +1,93 @@
+import numpy as np
+from typing import Dict, Iterable, Optional
+from bot.roi import RoiPlanner
+from config.settings import BOT_SETTINGS, DETECTION_SETTINGS
+
+
+class DetectionScheduler:
+    """
+    Runs each detector at the rate its current step needs.
+
+    DETECTION_SETTINGS['profiles'] gives every step (e.g. waiting for a bite
+    or for the action menu) a rate in Hz per detector; detectors without a
+    rate run every detection_interval. Detectors that are due on the same
+    frame, or within coalesce_window of it, are grabbed together in one
+    capture through the ROI planner. Detectors that are not due keep their
+    last image, so callers always see every active region.
+    """
+
+    def __init__(self, planner: RoiPlanner):
+        self.planner = planner
+        self.profile = None
+        self.periods: Dict[str, float] = {}
+        self.latest: Dict[str, np.ndarray] = {}
+        self._next_due: Dict[str, float] = {}
+
+        # Statistics
+        self.captures = 0
+        self.detector_runs: Dict[str, int] = {}
+
+    def configure(self, detectors: Iterable[str], profile: Optional[str] = None):
+        """
+        Select the active detectors and the rate profile; all of them are due right away.
+
+        Args:
+            detectors: Names of the detectors (ROI regions) to run
+            profile: Key of DETECTION_SETTINGS['profiles'], default rates if None or unknown
+        """
+        rates = DETECTION_SETTINGS['profiles'].get(profile, {})
+        default_period = BOT_SETTINGS['detection_interval']
+        self.profile = profile
+        self.periods = {
+            name: 1.0 / rates[name] if rates.get(name) else default_period
+            for name in detectors
+        }
+        self.latest = {name: image for name, image in self.latest.items() if name in self.periods}
+        self._next_due = {name: float('-inf') for name in self.periods}
+
+    def invalidate(self):
+        """Forget all images and make every detector due, e.g. after input changed the screen."""
+        self.latest.clear()
+        self._next_due = {name: float('-inf') for name in self.periods}
+
+    def poll(self, now: float) -> Dict[str, np.ndarray]:
+        """
+        Capture the detectors that are due and return the latest image of every active detector.
+
+        Args:
+            now: Current loop time
+        """
+        horizon = now + DETECTION_SETTINGS['coalesce_window']
+        due = [name for name, next_due in self._next_due.items() if next_due <= horizon]
+
+        if due:
+            self.planner.set_active(due)
+            self.latest.update(self.planner.capture())
+            self.captures += 1
+
+            for name in due:
+                period = self.periods[name]
+                # Stay on the detector's own grid unless we fell more than a period behind
+                next_due = self._next_due[name] + period
+                self._next_due[name] = next_due if next_due > now else now + period
+                self.detector_runs[name] = self.detector_runs.get(name, 0) + 1
+
+        return dict(self.latest)
+
+    def delay(self, now: float) -> float:
+        """Seconds until the next detector is due."""
+        if not self._next_due:
+            return BOT_SETTINGS['detection_interval']
+        return max(0.0, min(self._next_due.values()) - now)
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get scheduling statistics.
+
+        Returns:
+            Dict with the number of captures and how often each detector ran
+        """
+        return {
+            'captures': self.captures,
+            'detector_runs': dict(self.detector_runs),
+        }
@@ -0,0 +1,139 @@
+import numpy as np
+from typing import Tuple, Optional
+from bot.errors import ClientError
+from utils.logger import setup_logger
+
+
+class ScreenCapture:
+    """
+    Grabs frames of the game window and samples regions of them.
+
+    With mss installed, grab() reads only the requested region from the screen
+    (BitBlt on Windows, XGetImage on X11). Otherwise it falls back to
+    pyautogui, which grabs the whole screen and crops it, so a small region
+    costs as much as a full frame.
+    """
+
+    def __init__(self):
+        self.logger = setup_logger()
+        self.window_region = None
+        # mss instance (None: not loaded yet, False: not installed); grabs only happen on the event loop thread
+        self._mss = None
+        self._screen_pixels = None
+
+    @property
+    def region_capture(self) -> bool:
+        """True if grabbing a region only reads that region, False if every grab reads the whole screen."""
+        return self._load_mss() is not None
+
+    def captured_pixels(self, region: Tuple[int, int, int, int]) -> int:
+        """Pixels actually read from the screen to grab a region."""
+        if self.region_capture:
+            return region[2] * region[3]
+        if self._screen_pixels is None:
+            import pyautogui
+            size = pyautogui.size()
+            self._screen_pixels = size.width * size.height
+        return self._screen_pixels
+
+    def set_window_region(self, window_region: Optional[Tuple[int, int, int, int]]):
+        """Set the window region that relative regions are resolved against."""
+        self.window_region = window_region
+        self.logger.info(f"Screen capture window region set to: {window_region}")
+
+    def resolve_region(self, relative_region: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+        """
+        Convert a region given as fractions of the window into screen pixels.
+
+        Args:
+            relative_region: (x, y, width, height) as fractions of the window size
+
+        Returns:
+            Tuple of (x, y, width, height) in absolute screen coordinates
+        """
+        if self.window_region:
+            win_x, win_y, win_w, win_h = self.window_region
+        else:
+            import pyautogui
+            size = pyautogui.size()
+            win_x, win_y, win_w, win_h = 0, 0, size.width, size.height
+
+        rel_x, rel_y, rel_w, rel_h = relative_region
+        return (
+            win_x + int(rel_x * win_w),
+            win_y + int(rel_y * win_h),
+            max(1, int(rel_w * win_w)),
+            max(1, int(rel_h * win_h)),
+        )
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Capture a screen region as an RGB array.
+
+        Args:
+            region: (x, y, width, height) in screen pixels, defaults to the window region
+
+        Returns:
+            Array of shape (height, width, 3) with dtype uint8
+        """
+        region = region or self.window_region
+        sct = self._load_mss()
+        try:
+            if sct is not None:
+                if region:
+                    x, y, w, h = region
+                    monitor = {'left': x, 'top': y, 'width': w, 'height': h}
+                else:
+                    monitor = sct.monitors[1]
+                # BGRA to RGB
+                return np.ascontiguousarray(np.asarray(sct.grab(monitor))[..., 2::-1])
+
+            # Imported here so headless runs (simulator, CI) never need a display
+            import pyautogui
+            screenshot = pyautogui.screenshot(region=region)
+        except Exception as e:
+            raise ClientError(f"screen capture failed: {e}") from e
+        return np.asarray(screenshot.convert('RGB'))
+
+    def _load_mss(self):
+        if self._mss is None:
+            # mss is optional, pyautogui works everywhere
+            try:
+                import mss
+                self._mss = mss.mss()
+            except ImportError:
+                self.logger.debug("mss not installed, screen regions are cropped from full-screen grabs")
+                self._mss = False
+        return self._mss or None
+
+    def grab_relative(self, relative_region: Tuple[float, float, float, float]) -> np.ndarray:
+        """Capture a region given as fractions of the window."""
+        return self.grab(self.resolve_region(relative_region))
+
+    @staticmethod
+    def crop_relative(frame: np.ndarray, relative_region: Tuple[float, float, float, float]) -> np.ndarray:
+        """
+        Cut a region given as fractions of the frame out of a window frame.
+
+        Args:
+            frame: Window frame as returned by grab()
+            relative_region: (x, y, width, height) as fractions of the frame size
+
+        Returns:
+            View into the frame covering the region
+        """
+        frame_h, frame_w = frame.shape[:2]
+        rel_x, rel_y, rel_w, rel_h = relative_region
+        x, y = int(rel_x * frame_w), int(rel_y * frame_h)
+        w, h = max(1, int(rel_w * frame_w)), max(1, int(rel_h * frame_h))
+        return frame[y:y + h, x:x + w]
+
+    @staticmethod
+    def mean_color(image: np.ndarray) -> Tuple[float, float, float]:
+        """Get the mean RGB color of an image."""
+        return tuple(image.mean(axis=(0, 1)))
+
+    @staticmethod
+    def color_distance(color_a, color_b) -> float:
+        """Euclidean distance between two RGB colors."""
+        return float(np.linalg.norm(np.asarray(color_a, dtype=np.float32) - np.asarray(color_b, dtype=np.float32)))
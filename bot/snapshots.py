@@ -0,0 +1,225 @@
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from config.settings import MEMORY_SETTINGS, SNAPSHOT_SETTINGS
+from utils.logger import setup_logger
+from utils.memory import BudgetRegistry, budgets
+
+
+class FrameRing:
+    """
+    The last few window frames, newest last.
+
+    Frames are kept by reference, so pushing one costs no copy; producers must
+    not modify a frame after pushing it. The ring reports its size to the
+    memory budget registry as 'snapshots.frames'.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, registry: Optional[BudgetRegistry] = None):
+        self.frames: Deque[Tuple[float, np.ndarray]] = deque(maxlen=capacity or SNAPSHOT_SETTINGS['ring_size'])
+        (registry or budgets).register(
+            'snapshots.frames', MEMORY_SETTINGS['budgets']['snapshots.frames'], self.nbytes, self.evict
+        )
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def push(self, frame: np.ndarray, timestamp: Optional[float] = None):
+        """Add a frame, dropping the oldest one if the ring is full."""
+        self.frames.append((timestamp if timestamp is not None else time.time(), frame))
+
+    def latest(self, count: int = 1) -> List[Tuple[float, np.ndarray]]:
+        """The newest frames (up to count) with their wall-clock timestamps, oldest first."""
+        return list(self.frames)[-count:] if count > 0 else []
+
+    def nbytes(self) -> int:
+        return sum(frame.nbytes for _, frame in self.frames)
+
+    def evict(self, nbytes: int) -> int:
+        """Drop the oldest frames until at least nbytes were freed (the newest frame stays)."""
+        freed = 0
+        while freed < nbytes and len(self.frames) > 1:
+            freed += self.frames.popleft()[1].nbytes
+        return freed
+
+
+class SnapshotArchiver:
+    """
+    Saves frames from the ring to disk for later review, off the event loop.
+
+    snapshot() only queues references to the newest ring frames; a worker
+    thread encodes them with Pillow (SNAPSHOT_SETTINGS['format'] and
+    'quality'). A frame whose 64-bit difference hash is within dedup_distance
+    bits of one of the last dedup_history frames saved by snapshots taken in
+    the past dedup_window seconds (on self.clock) is skipped, e.g. the unchanged frames of a frozen screen or a
+    failure that repeats every cycle. Target species snapshots are only
+    compared within themselves, so every encounter is saved (a hash this
+    coarse cannot tell two species apart). The oldest files are deleted
+    whenever the archive grows past max_bytes. If the worker falls behind, new
+    snapshots are dropped rather than blocking the bot.
+    """
+
+    EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp'}
+
+    def __init__(self, frames: FrameRing):
+        self.logger = setup_logger()
+        self.frames = frames
+        self.output_dir = SNAPSHOT_SETTINGS['output_dir']
+        # Clock for the dedup window, e.g. the simulator's virtual time
+        self.clock: Callable[[], float] = time.monotonic
+
+        # Written by the worker thread only
+        self.files: Deque[Tuple[str, int]] = deque()
+        self.archive_bytes = 0
+        # (snapshot clock time, hash) of recently saved frames, newest last
+        self.recent: Deque[Tuple[float, int]] = deque(maxlen=SNAPSHOT_SETTINGS['dedup_history'])
+
+        # Statistics
+        self.stats = {'requested': 0, 'dropped': 0, 'saved': 0, 'duplicates': 0, 'evicted': 0, 'errors': 0}
+
+        self._queue: queue.Queue = queue.Queue(maxsize=SNAPSHOT_SETTINGS['queue_size'])
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the encoder thread."""
+        if not SNAPSHOT_SETTINGS['enabled'] or self.running:
+            return
+        self.output_dir = SNAPSHOT_SETTINGS['output_dir']
+        self._thread = threading.Thread(target=self._work, name='snapshot-archiver', daemon=True)
+        self._thread.start()
+        self.logger.info(f"📸 Snapshot archiver writing to {self.output_dir}")
+
+    def stop(self, timeout: float = 5.0):
+        """Finish the queued snapshots and stop the encoder thread."""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def snapshot(self, reason: str) -> bool:
+        """
+        Queue the newest ring frames for saving; returns immediately.
+
+        Args:
+            reason: Why the snapshot was taken (e.g. 'target-feebas'), used in the file names
+
+        Returns:
+            True if the snapshot was queued, False if there was nothing to save or the queue is full
+        """
+        if not self.running:
+            return False
+        frames = self.frames.latest(SNAPSHOT_SETTINGS['frames_per_snapshot'])
+        if not frames:
+            return False
+
+        self.stats['requested'] += 1
+        try:
+            self._queue.put_nowait((reason, self.clock(), frames))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            self.logger.warning(f"⚠️ Snapshot queue full, dropped '{reason}' snapshot")
+            return False
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the snapshot counts and the size of the archive on disk."""
+        return {**self.stats, 'archive_bytes': self.archive_bytes, 'archive_files': len(self.files)}
+
+    def _work(self):
+        """Worker thread: encode queued snapshots until stop() is called."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._scan_archive()
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            reason, taken_at, frames = item
+            # Target species snapshots only compare against their own frames
+            history = [] if reason.startswith('target-') else self.recent
+            # Hashes of the frames saved for this snapshot
+            saved: List[int] = []
+            for index, (timestamp, frame) in enumerate(frames):
+                try:
+                    frame_hash = self.dhash(frame)
+                    if self._is_duplicate(frame_hash, taken_at, history, saved):
+                        self.stats['duplicates'] += 1
+                        continue
+                    self._save(reason, index, timestamp, frame)
+                    saved.append(frame_hash)
+                    self.recent.append((taken_at, frame_hash))
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    self.logger.error(f"❌ Could not save '{reason}' snapshot: {e}")
+
+    def _is_duplicate(self, frame_hash: int, taken_at: float, history: Iterable[Tuple[float, int]],
+                      saved: List[int]) -> bool:
+        """Whether the frame looks like one saved in this snapshot, or in history within dedup_window."""
+        window = SNAPSHOT_SETTINGS['dedup_window']
+        candidates = saved + [seen for seen_at, seen in history if taken_at - seen_at <= window]
+        return any(self.distance(frame_hash, seen) <= SNAPSHOT_SETTINGS['dedup_distance'] for seen in candidates)
+
+    def _save(self, reason: str, index: int, timestamp: float, frame: np.ndarray):
+        """Encode one frame, then enforce the quota."""
+
+        image_format = SNAPSHOT_SETTINGS['format'].upper()
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp)) + f'-{int(timestamp * 1000) % 1000:03d}'
+        name = f"{stamp}-{re.sub(r'[^A-Za-z0-9_-]+', '_', reason)}-{index}{self.EXTENSIONS[image_format]}"
+        path = os.path.join(self.output_dir, name)
+
+        options = {} if image_format == 'PNG' else {'quality': SNAPSHOT_SETTINGS['quality']}
+        Image.fromarray(frame).save(path, image_format, **options)
+
+        size = os.path.getsize(path)
+        self.files.append((path, size))
+        self.archive_bytes += size
+        self.stats['saved'] += 1
+        self._enforce_quota()
+
+    def _scan_archive(self):
+        """Pick up snapshots from earlier runs, oldest first, so they count towards the quota."""
+        entries = []
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            if os.path.splitext(name)[1] in self.EXTENSIONS.values() and os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name, path, stat.st_size))
+        entries.sort()
+
+        self.files = deque((path, size) for _, _, path, size in entries)
+        self.archive_bytes = sum(size for _, size in self.files)
+        self._enforce_quota()
+
+    def _enforce_quota(self):
+        """Delete the oldest snapshots while the archive is over max_bytes."""
+        while self.files and self.archive_bytes > SNAPSHOT_SETTINGS['max_bytes']:
+            path, size = self.files.popleft()
+            self.archive_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.stats['evicted'] += 1
+
+    @staticmethod
+    def dhash(frame: np.ndarray) -> int:
+        """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail."""
+        thumbnail = np.asarray(Image.fromarray(frame).convert('L').resize((9, 8), Image.BILINEAR), dtype=np.int16)
+        bits = (thumbnail[:, 1:] > thumbnail[:, :-1]).flatten()
+        return int(np.packbits(bits).view('>u8')[0])
+
+    @staticmethod
+    def distance(a: int, b: int) -> int:
+        """Number of differing bits between two hashes."""
+        return bin(a ^ b).count('1')
@@ -0,0 +1,205 @@
+import os
+import numpy as np
+from PIL import Image
+from typing import Dict, Tuple, Optional, List
+from config.settings import BOT_SETTINGS, SPRITE_SETTINGS
+from utils.logger import setup_logger
+
+
+class SpriteIndex:
+    """
+    Identifies encounter sprites by nearest-neighbor search over compact feature vectors.
+
+    Each sprite is reduced to a quantized color histogram of its foreground pixels plus a
+    downsampled shape mask. All vectors are L2-normalized and stacked into one matrix, so
+    identification is a single matrix-vector product (cosine similarity).
+    """
+
+    IMAGE_EXTENSIONS = ('.png', '.gif', '.bmp', '.jpg', '.jpeg')
+
+    def __init__(self):
+        self.logger = setup_logger()
+        self.names: List[str] = []
+        self.features = np.zeros((0, self.feature_size()), dtype=np.float32)
+
+    @staticmethod
+    def feature_size() -> int:
+        """Length of a feature vector with the current settings."""
+        return SPRITE_SETTINGS['color_levels'] ** 3 + SPRITE_SETTINGS['mask_size'] ** 2
+
+    def build(self, sprite_dir: str) -> int:
+        """
+        Build the index from a directory of sprite images.
+
+        The species name of each sprite is its file name without extension.
+
+        Args:
+            sprite_dir: Directory containing the sprite images
+
+        Returns:
+            Number of sprites indexed
+        """
+        self.logger.info(f"🗂️ Building sprite index from {sprite_dir}...")
+        images = {}
+
+        for file_name in sorted(os.listdir(sprite_dir)):
+            if not file_name.lower().endswith(self.IMAGE_EXTENSIONS):
+                continue
+
+            images[os.path.splitext(file_name)[0].lower()] = self.load_sprite(os.path.join(sprite_dir, file_name))
+
+        return self.build_from_images(images)
+
+    @staticmethod
+    def load_sprite(path: str) -> np.ndarray:
+        """Load a sprite image as RGBA if it has transparency, RGB otherwise."""
+        with Image.open(path) as sprite:
+            # Opaque formats (JPEG, BMP) get the same border-color background removal as the screen
+            transparent = 'A' in sprite.getbands() or 'transparency' in sprite.info
+            return np.asarray(sprite.convert('RGBA' if transparent else 'RGB'))
+
+    def build_from_images(self, images: Dict[str, np.ndarray]) -> int:
+        """
+        Build the index from sprite images already in memory.
+
+        Args:
+            images: Species name to RGB or RGBA sprite image
+
+        Returns:
+            Number of sprites indexed
+        """
+        names, vectors = [], []
+
+        for name, image in images.items():
+            vector = self.extract_features(image)
+            if vector is None:
+                self.logger.warning(f"⚠️ Skipping {name}: no foreground pixels")
+                continue
+
+            names.append(name)
+            vectors.append(vector)
+
+        self.names = names
+        self.features = np.vstack(vectors) if vectors else np.zeros((0, self.feature_size()), dtype=np.float32)
+        self.logger.info(f"✅ Indexed {len(self.names)} sprites ({self.features.nbytes / 1024:.1f} KiB)")
+        return len(self.names)
+
+    def save(self, path: str):
+        """Save the index to a .npz file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, names=np.array(self.names), features=self.features)
+        self.logger.info(f"💾 Sprite index saved to {path}")
+
+    def load(self, path: str) -> bool:
+        """
+        Load an index saved with save().
+
+        Returns:
+            bool: True if the index was loaded, False if it is missing or stale
+        """
+        if not os.path.exists(path):
+            self.logger.warning(f"⚠️ Sprite index not found at {path}, species identification disabled")
+            return False
+
+        with np.load(path) as data:
+            names = [str(name) for name in data['names']]
+            features = data['features'].astype(np.float32)
+
+        if features.shape[1] != self.feature_size():
+            self.logger.warning(f"⚠️ Sprite index at {path} was built with different settings, please rebuild it")
+            return False
+
+        self.names = names
+        self.features = np.ascontiguousarray(features)
+        self.logger.info(f"✅ Loaded sprite index with {len(self.names)} sprites")
+        return True
+
+    def identify(self, image: np.ndarray) -> Tuple[Optional[str], float]:
+        """
+        Identify the species shown in an encounter sprite.
+
+        Args:
+            image: RGB (or RGBA) crop containing the sprite
+
+        Returns:
+            Tuple of (species, confidence). Species is None when the best match
+            is below BOT_SETTINGS['confidence_threshold'].
+        """
+        if not self.names:
+            return None, 0.0
+
+        vector = self.extract_features(image)
+        if vector is None:
+            return None, 0.0
+
+        similarities = self.features @ vector
+        best = int(np.argmax(similarities))
+        confidence = float(similarities[best])
+
+        if confidence < BOT_SETTINGS['confidence_threshold']:
+            return None, confidence
+        return self.names[best], confidence
+
+    def extract_features(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Turn a sprite image into a normalized feature vector.
+
+        Args:
+            image: RGB or RGBA image array
+
+        Returns:
+            Feature vector, or None if the image has no foreground
+        """
+        rgb, mask = self.split_foreground(image)
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if rows.size == 0:
+            return None
+
+        # Crop to the bounding box so position and scale don't matter
+        rgb = rgb[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+        mask = mask[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+        size = SPRITE_SETTINGS['size']
+        rgb = np.asarray(Image.fromarray(np.ascontiguousarray(rgb)).resize((size, size), Image.NEAREST))
+        mask_image = Image.fromarray(mask.astype(np.uint8) * 255)
+        small_mask = np.asarray(mask_image.resize((size, size), Image.NEAREST)) > 127
+
+        # Color histogram over foreground pixels
+        levels = SPRITE_SETTINGS['color_levels']
+        quantized = rgb[small_mask].astype(np.int32) * levels // 256
+        bins = (quantized[:, 0] * levels + quantized[:, 1]) * levels + quantized[:, 2]
+        histogram = np.bincount(bins, minlength=levels ** 3).astype(np.float32)
+
+        # Downsampled shape mask
+        mask_size = SPRITE_SETTINGS['mask_size']
+        shape = np.asarray(mask_image.resize((mask_size, mask_size), Image.BOX), dtype=np.float32).ravel()
+
+        vector = np.concatenate([
+            self._normalize(histogram) * SPRITE_SETTINGS['color_weight'],
+            self._normalize(shape) * SPRITE_SETTINGS['shape_weight'],
+        ])
+        return self._normalize(vector)
+
+    @staticmethod
+    def split_foreground(image: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Separate the RGB pixels from a boolean foreground mask."""
+        if image.shape[2] == 4:
+            if not image[..., 3].all():
+                return image[..., :3], image[..., 3] > 0
+            # Fully opaque: the alpha channel says nothing about the background
+            image = image[..., :3]
+
+        # No usable alpha channel: treat pixels close to the border color as background
+        border = np.concatenate([image[0], image[-1], image[:, 0], image[:, -1]])
+        background = np.median(border, axis=0)
+        distance = np.abs(image.astype(np.int16) - background.astype(np.int16)).sum(axis=2)
+        return image, distance > SPRITE_SETTINGS['background_tolerance']
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        """Scale a vector to unit length."""
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -0,0 +1,275 @@
+import asyncio
+import zlib
+from collections import deque
+from typing import Callable, Dict, Optional
+from bot.actions import ActionHandler
+from bot.input_backend import needs_focus
+from bot.screen import ScreenCapture
+from bot.snapshots import FrameRing
+from config.settings import WATCHDOG_SETTINGS
+from utils.logger import setup_logger
+from utils.store import EventStore
+from utils.tracing import tracer
+
+
+class Watchdog:
+    """
+    Detects a frozen, crashed or stuck game client and recovers from it.
+
+    Three signals are monitored: frame liveness (hashes of downsampled frames
+    that stop changing), process liveness, and expectations registered with
+    expect() that are not met in time. On failure the watchdog escalates
+    through WATCHDOG_SETTINGS['recovery_steps'] until the client is healthy.
+    """
+
+    def __init__(self, process_manager, calibrator, screen: ScreenCapture,
+                 action_handler: ActionHandler, store: EventStore, frames: Optional[FrameRing] = None):
+        self.logger = setup_logger()
+        self.process_manager = process_manager
+        self.calibrator = calibrator
+        self.screen = screen
+        self.action_handler = action_handler
+        self.store = store
+        # Liveness frames are also kept here for snapshots
+        self.frames = frames
+
+        # Called with the failure reason before recovery starts (e.g. to cancel the running cycle)
+        self.on_failure: Optional[Callable[[str], None]] = None
+
+        self.frame_hashes = deque()
+        self.expectations: Dict[str, float] = {}
+        self.healthy = asyncio.Event()
+        self.healthy.set()
+        self.recovering = False
+        self.gave_up = False
+        self.recoveries = 0
+
+        self._escalation_level = 0
+        self._last_recovery = None
+        self._failed_recoveries = 0
+        self._monitor_task = None
+        self._recovery_task = None
+        self._lock = asyncio.Lock()
+
+    def start(self):
+        """Start the background monitor task."""
+        if self._monitor_task is None:
+            self._monitor_task = asyncio.ensure_future(self._monitor())
+            self._monitor_task.set_name('watchdog')
+            self.logger.info("🐕 Watchdog started")
+
+    async def stop(self):
+        """Stop the monitor and any running recovery."""
+        for task in (self._monitor_task, self._recovery_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._monitor_task = None
+        self._recovery_task = None
+
+    def expect(self, name: str, timeout: float):
+        """Register something that must happen within timeout seconds (see fulfil())."""
+        self.expectations[name] = asyncio.get_running_loop().time() + timeout
+
+    def fulfil(self, name: str):
+        """Mark an expectation as met."""
+        self.expectations.pop(name, None)
+
+    async def wait_healthy(self):
+        """Wait until no recovery is in progress."""
+        await self.healthy.wait()
+
+    def report_failure(self, reason: str):
+        """
+        Report a failure noticed elsewhere (e.g. an action that raised) and start recovering.
+
+        Does nothing if a recovery is already running.
+        """
+        if self.recovering:
+            return
+        self.recovering = True
+        self.healthy.clear()
+        self.logger.warning(f"🚨 Watchdog triggered: {reason}")
+        self.store.record_failure(None, 'watchdog', reason)
+
+        if self.on_failure:
+            self.on_failure(reason)
+        self._recovery_task = asyncio.ensure_future(self._recover(reason))
+        self._recovery_task.set_name('watchdog-recovery')
+
+    async def _monitor(self):
+        """Periodically check liveness and expectations."""
+        while True:
+            await asyncio.sleep(WATCHDOG_SETTINGS['check_interval'])
+            if self.recovering:
+                continue
+
+            reason = self._check()
+            if reason:
+                self.report_failure(reason)
+
+    def _check(self) -> Optional[str]:
+        """
+        Run all health checks once.
+
+        Returns:
+            A description of the first problem found, or None if healthy
+        """
+        now = asyncio.get_running_loop().time()
+
+        if not self.process_manager.is_pokemmo_alive():
+            return "PokéMMO process is gone"
+
+        try:
+            frame_hash = self._frame_hash()
+        except Exception as e:
+            return f"screen capture failed: {e}"
+
+        self._remember_hash(now, frame_hash)
+        if self._is_frozen(now):
+            return f"frame unchanged for {WATCHDOG_SETTINGS['freeze_timeout']:.0f}s"
+
+        for name, deadline in self.expectations.items():
+            if now > deadline:
+                return f"expected '{name}' not reached in time"
+
+        return None
+
+    def _frame_hash(self) -> int:
+        """Hash a downsampled window frame."""
+        with tracer.span('watchdog_capture', 'capture'):
+            frame = self.screen.grab()
+        if self.frames is not None:
+            self.frames.push(frame)
+        return zlib.crc32(frame[::8, ::8].tobytes())
+
+    def _remember_hash(self, now: float, frame_hash: int):
+        """Keep the hashes of the last freeze_timeout seconds."""
+        self.frame_hashes.append((now, frame_hash))
+        while self.frame_hashes and now - self.frame_hashes[0][0] > WATCHDOG_SETTINGS['freeze_timeout']:
+            self.frame_hashes.popleft()
+
+    def _is_frozen(self, now: float) -> bool:
+        """Frozen if every frame over the full freeze_timeout window looked the same."""
+        if not self.frame_hashes:
+            return False
+        oldest = self.frame_hashes[0][0]
+        if now - oldest < WATCHDOG_SETTINGS['freeze_timeout'] - WATCHDOG_SETTINGS['check_interval']:
+            return False
+        first_hash = self.frame_hashes[0][1]
+        return all(frame_hash == first_hash for _, frame_hash in self.frame_hashes)
+
+    async def _recover(self, reason: str) -> bool:
+        """
+        Escalate through the recovery steps until the client is healthy again.
+
+        Steps that worked recently are skipped: a failure soon after a
+        recovery starts at the next step instead of repeating the last one.
+
+        Returns:
+            bool: True if the client recovered, False if the watchdog gave up
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            detected_at = loop.time()
+            steps = WATCHDOG_SETTINGS['recovery_steps']
+
+            if self._last_recovery is None or detected_at - self._last_recovery > WATCHDOG_SETTINGS['escalation_window']:
+                self._escalation_level = 0
+            level = min(self._escalation_level, len(steps) - 1)
+
+            try:
+                while True:
+                    for index in range(level, len(steps)):
+                        step = steps[index]
+                        self.logger.info(f"🩹 Recovery step {index + 1}/{len(steps)}: {step}")
+                        try:
+                            await getattr(self, f'_step_{step}')()
+                        except Exception as e:
+                            self.logger.error(f"❌ Recovery step '{step}' failed: {e}")
+                            continue
+
+                        if await self._verify():
+                            recovery_time = loop.time() - detected_at
+                            self.recoveries += 1
+                            self._escalation_level = index + 1
+                            self._last_recovery = loop.time()
+                            self._failed_recoveries = 0
+                            self.logger.info(f"✅ Recovered with '{step}' in {recovery_time:.1f}s ({reason})")
+                            self.store.record_metric('watchdog.recovery_seconds', recovery_time)
+                            return True
+
+                    self._failed_recoveries += 1
+                    if self._failed_recoveries >= WATCHDOG_SETTINGS['max_failed_recoveries']:
+                        self.logger.error(f"❌ Watchdog gave up after {self._failed_recoveries} failed recoveries")
+                        self.gave_up = True
+                        return False
+                    level = 0
+            finally:
+                self.frame_hashes.clear()
+                self.expectations.clear()
+                self.recovering = False
+                self.healthy.set()
+
+    async def _verify(self) -> bool:
+        """Check that the process runs and frames change again within verify_time."""
+        samples = 4
+        try:
+            first = self._frame_hash()
+            for _ in range(samples):
+                await asyncio.sleep(WATCHDOG_SETTINGS['verify_time'] / samples)
+                if not self.process_manager.is_pokemmo_alive():
+                    return False
+                if self._frame_hash() != first:
+                    return True
+        except Exception as e:
+            self.logger.debug(f"Verification capture failed: {e}")
+        return False
+
+    async def _step_refocus(self):
+        """Bring the client window back to the foreground, or only un-minimize it for background input."""
+        if not needs_focus():
+            if not self.process_manager.restore_window():
+                raise RuntimeError("could not restore the window")
+            return
+        if not self.process_manager.focus_window():
+            raise RuntimeError("could not focus the window")
+
+    async def _step_redetect_window(self):
+        """Find the process and window again and update the regions."""
+        if not self.process_manager.find_pokemmo_process():
+            raise RuntimeError("process not found")
+        if not self.process_manager.find_pokemmo_window():
+            raise RuntimeError("window not found")
+        self.process_manager.get_window_info()
+        if needs_focus():
+            self.process_manager.focus_window()
+        else:
+            self.process_manager.restore_window()
+        self._apply_window_region(self.process_manager.get_window_region())
+
+    async def _step_relaunch_client(self):
+        """Restart the game client."""
+        command = WATCHDOG_SETTINGS['launch_command']
+        if not command:
+            raise RuntimeError("no launch_command configured")
+        if not self.process_manager.restart_pokemmo(command):
+            raise RuntimeError("could not start the client")
+
+        # Give the client time to start before looking for its window
+        await asyncio.sleep(WATCHDOG_SETTINGS['launch_wait'])
+        await self._step_redetect_window()
+
+    async def _step_recalibrate(self):
+        """Recalibrate the screen and window region."""
+        if not await self.calibrator.calibrate():
+            raise RuntimeError("calibration failed")
+        self._apply_window_region(self.process_manager.get_window_region() or self.calibrator.get_window_region())
+
+    def _apply_window_region(self, window_region):
+        if window_region:
+            self.action_handler.set_window_region(window_region)
+            self.screen.set_window_region(window_region)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Report cycle and encounter statistics from the event store.
+"""
+
+import argparse
+import time
+from config.settings import STORE_SETTINGS
+from utils.store import StoreQueries
+
+
+def main():
+    """Print rates, percentiles and per-hour breakdowns."""
+
+    parser = argparse.ArgumentParser(description="Show bot statistics from the event store")
+    parser.add_argument('--db', default=STORE_SETTINGS['path'], help="Path to the event store database")
+    parser.add_argument('--hours', type=float, default=0, help="Only include the last N hours (0 = everything)")
+    parser.add_argument('--hourly', action='store_true', help="Show a per-hour breakdown")
+    args = parser.parse_args()
+
+    since = time.time() - args.hours * 3600 if args.hours else 0.0
+    queries = StoreQueries(args.db)
+    start = time.perf_counter()
+
+    try:
+        summary = queries.cycle_summary(since)
+        print(f"📊 Cycles: {summary['cycles']}  ({summary['cycles_per_hour']:.1f}/h)")
+        print(f"   Success rate: {summary['success_rate']:.1%}")
+        print(f"   Hook rate:    {summary['hook_rate']:.1%}")
+        print(f"   Mean cycle:   {summary['mean_duration']:.2f}s")
+
+        percentiles = queries.duration_percentiles(since=since)
+        if percentiles:
+            print("⏱️ Cycle duration: " + "  ".join(f"p{p}={value:.2f}s" for p, value in percentiles.items()))
+
+        species = queries.species_frequency(since)
+        if species:
+            total = sum(count for _, count in species)
+            print(f"🐟 Species ({total} encounters):")
+            for name, count in species:
+                print(f"   {name:<20} {count:>8}  {count / total:.1%}")
+
+        failures = queries.failure_counts(since)
+        if failures:
+            print("❌ Failures:")
+            for kind, count in failures:
+                print(f"   {kind:<20} {count:>8}")
+
+        metrics = queries.metric_summaries(since)
+        if metrics:
+            print("📐 Metrics:")
+            for name, count, mean, maximum in metrics:
+                print(f"   {name:<32} n={count:<8} mean={mean:.3f}  max={maximum:.3f}")
+
+        if args.hourly:
+            print("🕐 Per hour:")
+            for hour, cycles, hook_rate, mean_duration in queries.hourly(since):
+                print(f"   {hour}  {cycles:>6} cycles  hook {hook_rate:.1%}  mean {mean_duration:.2f}s")
+    finally:
+        queries.close()
+
+    print(f"(queried in {(time.perf_counter() - start) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 # Bot configuration settings
+import json
+import os
 
 # Screen and window settings
 SCREEN_SETTINGS = {
@@ -16,6 +18,16 @@ BOT_SETTINGS = {
     'confidence_threshold': 0.8,  # image matching confidence
 }
 
+# Input delivery settings
+INPUT_SETTINGS = {
+    # 'pyautogui' types into the focused window; 'background' sends to the game window without
+    # focusing it ('postmessage' on Windows, 'x11' elsewhere), or pick 'postmessage'/'x11' directly
+    'backend': 'pyautogui',
+    # 'send_event' (XSendEvent, no focus change) or 'xtest' (moves the input focus to the window on every
+    # key event; only for a single client on its own display, e.g. Xvfb)
+    'x11_method': 'send_event',
+}
+
 # Logging settings
 LOGGING_SETTINGS = {
     'level': 'INFO',
@@ -36,5 +48,200 @@ ACTION_SETTINGS = {
     'teleport': {
         'key': '4',  # Key to press for teleport
         'wait_time': 4.0,  # Seconds to wait after teleport
-    }
+    },
+    'walking_to_beach': {
+        'steps': [('down', 4.0), ('left', 2.0), ('down', 1.0), ('right', 2.0), ('down', 1.0)],  # (arrow key, seconds held)
+    },
+}
+
+# Battle handling settings
+BATTLE_SETTINGS = {
+    'policy': 'run',  # 'run', 'fight' or 'catch'
+    'move_index': 1,  # move slot (1-4) used by the 'fight' policy
+    'confirm_key': 'z',
+    'back_key': 'x',
+    'catch_sequence': ['right', 'z', 'z'],  # keys pressed from the FIGHT slot to throw a ball
+    'entry_timeout': 8.0,  # seconds to wait for a bite/battle after fishing
+    'turn_timeout': 15.0,  # seconds to wait for the action menu each turn
+    'exit_timeout': 10.0,  # seconds to wait for the overworld after the battle
+    'max_turns': 10,  # turns before giving up on the policy and running away
+    'species_policies': {},  # per-species policy overrides, e.g. {'feebas': 'catch'}
+    'target_species': [],  # species that trigger an alert when encountered
+    'color_tolerance': 40.0,  # max RGB distance for a region to match its reference color
+    'black_threshold': 12.0,  # mean brightness below this counts as a transition frame
+    # Regions are (x, y, width, height) as fractions of the game window
+    'regions': {
+        'enemy_hp_box': (0.05, 0.08, 0.35, 0.12),
+        'action_menu': (0.55, 0.78, 0.43, 0.20),
+        'move_menu': (0.02, 0.78, 0.66, 0.20),
+        'message_box': (0.02, 0.78, 0.96, 0.20),
+        'enemy_sprite': (0.55, 0.10, 0.30, 0.38),
+    },
+    # Reference RGB colors sampled from the default PokéMMO theme
+    'colors': {
+        'enemy_hp_box': (248, 248, 216),
+        'action_menu': (40, 80, 104),
+        'move_menu': (248, 248, 248),
+        'message_box': (40, 48, 48),
+    },
+}
+
+# Region-of-interest capture settings
+ROI_SETTINGS = {
+    'merge_overhead': 4096,  # pixels a separate grab costs with region capture (mss); regions are merged when the union adds fewer
+}
+
+# Detection rate settings
+DETECTION_SETTINGS = {
+    'coalesce_window': 0.02,  # seconds; detectors due this close together share one capture
+    # Rates in Hz per detector for each battle step; unlisted detectors run every detection_interval.
+    # Only the bite window needs a fast reaction, the other steps wait for slow menu transitions.
+    'profiles': {
+        # The bite window is short, so its cue and the battle start are polled at full rate
+        'bite': {'message_box': 60.0, 'enemy_hp_box': 60.0},
+        'turn': {'action_menu': 10.0, 'message_box': 5.0, 'enemy_hp_box': 5.0},  # waiting for the action menu
+        'move_menu': {'move_menu': 10.0, 'enemy_hp_box': 2.0},
+        'exit': {'enemy_hp_box': 5.0, 'message_box': 5.0},  # waiting for the overworld after a battle
+    },
+}
+
+# Sprite identification settings
+SPRITE_SETTINGS = {
+    'index_path': 'data/sprite_index.npz',  # built with build_sprite_index.py
+    'size': 32,  # sprites are cropped to their bounding box and resized to size x size
+    'mask_size': 16,  # resolution of the downsampled shape mask
+    'color_levels': 4,  # quantization levels per RGB channel for the color histogram
+    'color_weight': 1.0,  # relative weight of the color histogram in the feature vector
+    'shape_weight': 1.0,  # relative weight of the shape mask in the feature vector
+    'background_tolerance': 30,  # RGB distance from the border color that still counts as background
+}
+
+# Event store settings
+STORE_SETTINGS = {
+    'path': 'data/bot.db',  # SQLite database with cycles, encounters and failures
+    'batch_size': 500,  # max rows written per transaction
+    'flush_interval': 1.0,  # seconds between writes when the queue is quiet
+    'queue_size': 100000,  # records beyond this are dropped instead of blocking the bot
+}
+
+# Memory instrumentation settings
+MEMORY_SETTINGS = {
+    'snapshot_interval': 60.0,  # seconds between memory snapshots written as metrics
+    'tracemalloc': False,  # trace Python allocations for per-line diff reports (slows the bot down)
+    'tracemalloc_frames': 1,  # stack frames kept per traced allocation
+    'growth_threshold': 64 * 2**20,  # bytes of growth since the last baseline that trigger a diff report
+    'report_dir': 'data/memory',
+    'report_top': 20,  # allocation sites listed in a diff report
+    # Byte budgets of the caches and buffers registered with utils.memory
+    'budgets': {
+        'roi.plans': 64 * 2**10,  # about 1.7 KiB per plan, one plan per active detector set and window region
+        'simulator.overworld_frames': 16 * 2**20,
+        'snapshots.frames': 64 * 2**20,
+        'tracing.events': 24 * 2**20,
+    },
+}
+
+# Snapshot archive settings (frames saved for review on target species, failed cycles and watchdog triggers)
+SNAPSHOT_SETTINGS = {
+    'enabled': True,
+    'output_dir': 'data/snapshots',
+    'ring_size': 8,  # most recent window frames kept in memory (the watchdog adds one per check)
+    'frames_per_snapshot': 3,  # newest ring frames saved per snapshot
+    'format': 'JPEG',  # JPEG, WEBP or PNG
+    'quality': 85,  # JPEG/WebP quality (1-95), PNG is always lossless
+    'dedup_distance': 6,  # frames whose 64-bit perceptual hash differs from a recent one in at most this many bits are skipped
+    'dedup_history': 32,  # recently saved frame hashes compared against (target species snapshots only compare within themselves)
+    'dedup_window': 60.0,  # seconds; frames saved by older snapshots no longer count as duplicates
+    'max_bytes': 256 * 2**20,  # disk quota, the oldest snapshots are deleted first
+    'queue_size': 16,  # pending snapshots; more are dropped instead of blocking the bot
 }
+
+# Sampling profiler settings (see profile_bot.py)
+PROFILER_SETTINGS = {
+    'control_port': 47811,  # local TCP port for start/stop/status commands, None to disable
+    'default_seconds': 10.0,  # profile length when started by signal or without a duration
+    'sample_interval': 0.005,  # seconds between stack samples
+    'output_dir': 'data/profiles',  # collapsed stack files (flamegraph.pl / speedscope)
+}
+
+# Span tracing settings (Chrome Trace Event export)
+TRACING_SETTINGS = {
+    'enabled': False,  # can also be switched at runtime (SIGUSR2 or profile_bot.py trace-start/trace-stop)
+    'max_events': 50000,  # oldest spans are dropped beyond this (about 420 bytes each, see the tracing.events budget)
+    'output_dir': 'data/traces',
+}
+
+# Timing optimizer settings (see optimize_timings.py)
+TUNING_SETTINGS = {
+    'trial_cycles': 30,  # cycles per evaluated setting
+    'bisection_steps': 6,  # halvings of the search interval per parameter
+    'max_success_drop': 0.02,  # allowed drop in cycle success rate compared to the current settings
+    'safety_margin': 0.1,  # tuned values are raised by this fraction of the value found
+    'lower_bounds': {  # seconds; parameters not listed can go down to 0
+        'action_delay': 0.02,
+    },
+    'overlay_path': os.path.join(os.path.dirname(__file__), 'tuned_settings.json'),  # tuned on the live client
+    # Tuned in the simulator; only reflects the simulator's model of the game and is never loaded
+    'simulated_overlay_path': os.path.join(os.path.dirname(__file__), 'tuned_settings.simulated.json'),
+    'apply_overlay': False,  # opt in: load overlay_path over these settings on import
+}
+
+# Headless simulator settings (see simulate.py)
+SIMULATOR_SETTINGS = {
+    'window_size': (160, 120),  # width, height of the rendered frames
+    'fade_time': 1.5,  # seconds of black screen after teleporting
+    'walk_speed': 4.0,  # tiles per second while an arrow key is held
+    'route': [('down', 4.0), ('left', 2.0), ('down', 1.0), ('right', 2.0), ('down', 1.0)],  # defines the fishing spot
+    'spot_tolerance': 0.5,  # tiles from the fishing spot that still count as at the water
+    'bite_delay': (1.0, 3.0),  # seconds until a bite (or no bite) after casting
+    'bite_window': 1.0,  # seconds to hook a bite before it gets away
+    'hook_rate': 0.4,  # chance that a cast gets a bite
+    'battle_transition': 1.0,  # seconds of black screen entering/leaving a battle
+    'battle_intro': 1.5,  # seconds before the first action menu
+    'turn_time': 2.0,  # seconds a move or ball throw animates
+    'run_success': 0.9,  # chance that RUN works
+    'faint_chance': 0.5,  # chance that a move knocks the wild Pokémon out
+    'catch_chance': 0.3,  # chance that a ball catches it
+    'freeze_rate': 0.0,  # chance per teleport that the client freezes until relaunched
+    'snapshot_dir': 'data/snapshots/simulator',  # keeps simulated snapshots apart from the real ones
+    'species': {  # species -> (body color, shape) drawn as the encounter sprite
+        'magikarp': ((232, 88, 56), 'wide'),
+        'tentacool': ((72, 144, 216), 'tall'),
+        'horsea': ((96, 176, 232), 'square'),
+        'feebas': ((152, 128, 96), 'wide'),
+    },
+}
+
+# Watchdog settings
+WATCHDOG_SETTINGS = {
+    'check_interval': 1.0,  # seconds between health checks
+    'freeze_timeout': 30.0,  # seconds of identical frames before the client counts as frozen
+    'cycle_timeout': 120.0,  # a cycle counts as stuck after this long without progress (restarted on every battle turn)
+    'recovery_steps': ['refocus', 'redetect_window', 'relaunch_client', 'recalibrate'],
+    'verify_time': 4.0,  # seconds to watch for changing frames after a recovery step
+    'escalation_window': 300.0,  # a failure within this many seconds of a recovery skips the step that worked
+    'max_failed_recoveries': 3,  # stop the bot after this many rounds of failed recovery
+    'launch_command': None,  # e.g. r'C:\Program Files\PokeMMO\PokeMMO.exe', needed for relaunching
+    'launch_wait': 30.0,  # seconds to wait for a relaunched client
+}
+
+
+def _merge(target: dict, overlay: dict):
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def load_overlay(path: str):
+    """Apply a JSON overlay like {"ACTION_SETTINGS": {"teleport": {"wait_time": 1.7}}} over these settings."""
+    with open(path, encoding='utf-8') as f:
+        overlay = json.load(f)
+    for section, values in overlay.items():
+        _merge(globals()[section], values)
+
+
+# Timings tuned by optimize_timings.py --live replace the defaults above, once opted in
+if TUNING_SETTINGS['apply_overlay'] and os.path.exists(TUNING_SETTINGS['overlay_path']):
+    load_overlay(TUNING_SETTINGS['overlay_path'])
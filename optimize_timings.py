@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tune the bot's waits and walking durations against the game simulator or the live client.
+"""
+
+import argparse
+from config.settings import LOGGING_SETTINGS, TUNING_SETTINGS
+from simulator.optimizer import TimingOptimizer
+
+
+def main():
+    """Bisect every timing parameter and write the fastest working settings."""
+
+    parser = argparse.ArgumentParser(description="Find the fastest timings that keep cycles working")
+    parser.add_argument('--cycles', type=int, default=TUNING_SETTINGS['trial_cycles'], help="Cycles per trial")
+    parser.add_argument('--live', action='store_true', help="Run the trials against the running PokéMMO client")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed shared by all simulated trials")
+    parser.add_argument('--only', nargs='+', metavar='PARAM', choices=TimingOptimizer.parameters(),
+                        help="Only tune these parameters")
+    parser.add_argument('--output', help="Settings overlay to write (default: overlay_path with --live, "
+                                          "else simulated_overlay_path)")
+    parser.add_argument('--dry-run', action='store_true', help="Print the results without writing the overlay")
+    args = parser.parse_args()
+
+    # Trials run hundreds of cycles, keep the bot's per-cycle logs out of the way
+    LOGGING_SETTINGS['level'] = 'WARNING'
+
+    optimizer = TimingOptimizer(args.cycles, args.seed, live=args.live)
+    result = optimizer.optimize(args.only)
+    baseline, tuned = result['baseline'], result['tuned']
+
+    print(f"⏱️ Tuned {len(result['values'])} parameter(s) in {len(optimizer.trials)} trials:")
+    for name, value in result['values'].items():
+        print(f"   {name:<20} {value:.3f}s")
+    print(f"   Cycle time:   {baseline['cycle_seconds']:.2f}s -> {tuned['cycle_seconds']:.2f}s")
+    print(f"   Success rate: {baseline['success_rate']:.0%} -> {tuned['success_rate']:.0%}")
+    print(f"   Successful cycles/h: {baseline['successes_per_hour']:.0f} -> {tuned['successes_per_hour']:.0f}")
+
+    if not args.dry_run:
+        path = TimingOptimizer.write_overlay(result['values'], args.output, live=args.live)
+        print(f"💾 Wrote {path}")
+        if args.live and not TUNING_SETTINGS['apply_overlay']:
+            print("   Set TUNING_SETTINGS['apply_overlay'] = True to use it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Ask a running bot to profile or trace itself through the local profiler control socket.
+"""
+
+import argparse
+import socket
+from config.settings import PROFILER_SETTINGS
+
+
+def main():
+    """Send one command to the profiler and print the reply."""
+
+    parser = argparse.ArgumentParser(description="Control the bot's sampling profiler and span tracing")
+    parser.add_argument('command', nargs='?', default='start',
+                        choices=['start', 'stop', 'status', 'trace-start', 'trace-stop'],
+                        help="start a profile, stop the running one, show the status, "
+                             "or switch span tracing on/off (trace-stop exports the trace)")
+    parser.add_argument('--seconds', type=float, help="Profile length (default from PROFILER_SETTINGS)")
+    parser.add_argument('--port', type=int, default=PROFILER_SETTINGS['control_port'], help="Control port")
+    args = parser.parse_args()
+
+    command = args.command
+    if command == 'start' and args.seconds:
+        command += f" {args.seconds}"
+
+    try:
+        with socket.create_connection(('127.0.0.1', args.port), timeout=5) as connection:
+            connection.sendall(f"{command}\n".encode())
+            reply = connection.makefile(encoding='utf-8').readline().strip()
+    except OSError as e:
+        print(f"❌ Could not reach the bot on port {args.port}: {e}")
+        return 1
+
+    print(f"🔬 {reply}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Run the bot headless against the game simulator for load and regression testing.
+"""
+
+import argparse
+import sys
+from config.settings import BATTLE_SETTINGS, LOGGING_SETTINGS, SIMULATOR_SETTINGS
+from simulator.runner import run_simulation
+from utils.profiler import profiler
+from utils.tracing import tracer
+
+
+def main():
+    """Run simulated cycles and check the bot's view against the game's ground truth."""
+
+    parser = argparse.ArgumentParser(description="Run the bot against the headless game simulator")
+    parser.add_argument('--cycles', type=int, default=1000, help="Number of cycles to run")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for the simulated game")
+    parser.add_argument('--policy', choices=['run', 'fight', 'catch'], help="Override the battle policy")
+    parser.add_argument('--freeze-rate', type=float, help="Chance per teleport that the client freezes")
+    parser.add_argument('--db', default=':memory:', help="Event store database (in-memory by default)")
+    parser.add_argument('--verbose', action='store_true', help="Show the bot's INFO logs")
+    parser.add_argument('--profile', type=float, metavar='SECONDS', help="Sample the bot's stacks for the first SECONDS")
+    parser.add_argument('--trace', action='store_true', help="Record spans and export a Chrome trace (game time)")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        LOGGING_SETTINGS['level'] = 'WARNING'
+    if args.policy:
+        BATTLE_SETTINGS['policy'] = args.policy
+    if args.freeze_rate is not None:
+        SIMULATOR_SETTINGS['freeze_rate'] = args.freeze_rate
+    if args.profile:
+        profiler.start(args.profile)
+    if args.trace:
+        tracer.enable()
+
+    report = run_simulation(args.cycles, args.seed, args.db)
+    game = report['game']
+    bot = report['bot']
+
+    print(f"🎮 Simulated {report['cycles']} cycles in {report['wall_seconds']:.1f}s "
+          f"({report['cycles_per_minute']:.0f} cycles/min, {report['virtual_seconds'] / 3600:.1f} game hours)")
+    print(f"   Game throughput: {report['cycles_per_hour']:.1f} cycles/h, "
+          f"{bot['encounters_per_hour']:.1f} encounters/h")
+    print(f"   Game: {game}")
+    print(f"   Species: {report['species_seen']}")
+    print(f"   Watchdog recoveries: {report['watchdog_recoveries']}")
+    print(f"   Bot phase totals: " + ", ".join(f"{phase}={total:.0f}s" for phase, total in bot['phase_totals'].items()))
+    capture = bot['capture']
+    print(f"   Capture: {capture['bytes_per_frame']:.0f} bytes/frame, {capture['grab_ms_per_frame']:.3f} ms/frame "
+          f"over {capture['frames']} frames ({capture['window_fraction']:.0%} of the window in the last plan)")
+    snapshots = report['snapshots']
+    print(f"   Snapshots: {snapshots['saved']} saved, {snapshots['duplicates']} duplicates skipped, "
+          f"{snapshots['dropped']} dropped, {snapshots['archive_bytes'] / 2**20:.1f} MiB on disk")
+
+    # Regression checks: the bot must see every battle and cast from the right spot
+    problems = []
+    if bot['encounters'] != game['battles']:
+        problems.append(f"bot counted {bot['encounters']} encounters, game had {game['battles']} battles")
+    recoverable_freezes = game['freezes'] - int(report['frozen_at_end'])
+    if game['restarts'] < recoverable_freezes:
+        problems.append(f"watchdog recovered {game['restarts']} of {recoverable_freezes} freezes")
+    if game['missed_casts']:
+        problems.append(f"{game['missed_casts']} cast(s) away from the fishing spot")
+
+    for problem in problems:
+        print(f"❌ {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Headless game simulator for load and regression testing
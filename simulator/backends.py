@@ -0,0 +1,99 @@
+import numpy as np
+from typing import Tuple, Optional
+from bot.screen import ScreenCapture
+from simulator.game import GameSimulator
+from utils.logger import setup_logger
+
+
+class SimulatedInput:
+    """Input backend that feeds key presses into the simulator."""
+
+    def __init__(self, game: GameSimulator):
+        self.game = game
+
+    def key_down(self, key: str):
+        self.game.key_down(key)
+
+    def key_up(self, key: str):
+        self.game.key_up(key)
+
+    def press(self, key: str):
+        self.game.press(key)
+
+    def click(self, x: int, y: int, button: str = 'left', clicks: int = 1):
+        pass
+
+
+class SimulatedScreen(ScreenCapture):
+    """Screen capture that returns frames rendered by the simulator."""
+
+    def __init__(self, game: GameSimulator):
+        super().__init__()
+        self.game = game
+        self.window_region = (0, 0, game.width, game.height)
+
+    @property
+    def region_capture(self) -> bool:
+        # Stands in for a region capture backend like mss
+        return True
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        frame = self.game.render()
+        if region is None:
+            return frame
+
+        win_x, win_y = self.window_region[:2]
+        x, y, w, h = region
+        return frame[y - win_y:y - win_y + h, x - win_x:x - win_x + w]
+
+
+class SimulatedProcessManager:
+    """Stands in for ProcessManager: the simulated client is always running."""
+
+    def __init__(self, game: GameSimulator):
+        self.logger = setup_logger()
+        self.game = game
+
+    def check_pokemmo_running(self) -> bool:
+        self.logger.info("✅ Simulated PokéMMO is running")
+        return True
+
+    def find_pokemmo_process(self) -> bool:
+        return True
+
+    def find_pokemmo_window(self) -> bool:
+        return True
+
+    def get_window_info(self):
+        return {'handle': None, 'title': 'PokeMMO (simulated)', 'size': (self.game.width, self.game.height)}
+
+    def focus_window(self) -> bool:
+        return True
+
+    def restore_window(self) -> bool:
+        return True
+
+    def is_pokemmo_alive(self) -> bool:
+        return True
+
+    def restart_pokemmo(self, command: str) -> bool:
+        self.logger.info("🔁 Restarting simulated PokéMMO...")
+        self.game.restart()
+        return True
+
+    def get_window_region(self) -> Optional[Tuple[int, int, int, int]]:
+        return (0, 0, self.game.width, self.game.height)
+
+
+class SimulatedCalibrator:
+    """Stands in for ScreenCalibrator: the simulated window never moves."""
+
+    def __init__(self, game: GameSimulator):
+        self.game = game
+        self.window_region = (0, 0, game.width, game.height)
+
+    async def calibrate(self) -> bool:
+        return True
+
+    def get_window_region(self) -> Optional[Tuple[int, int, int, int]]:
+        return self.window_region
@@ -0,0 +1,63 @@
+import asyncio
+import selectors
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """
+    Selector that never blocks on timers.
+
+    Real I/O (e.g. call_soon_threadsafe wakeups) is still polled, but instead
+    of sleeping until the next timer is due the virtual clock jumps forward.
+    """
+
+    def __init__(self, loop: 'VirtualClockEventLoop', selector: selectors.BaseSelector):
+        self._loop = loop
+        self._selector = selector
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._selector.modify(fileobj, events, data)
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events or timeout == 0:
+            return events
+
+        if timeout is None:
+            # Nothing scheduled: only another thread can wake us up
+            return self._selector.select(None)
+
+        self._loop.advance(timeout)
+        return events
+
+    def close(self):
+        self._selector.close()
+
+    def get_map(self):
+        return self._selector.get_map()
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop running on a virtual clock.
+
+    Whenever the loop would wait for a timer, time jumps straight to it, so
+    asyncio.sleep() and loop.time() based timeouts cost no wall-clock time.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        super().__init__(selectors.DefaultSelector())
+        self._selector = _VirtualTimeSelector(self, self._selector)
+        self._virtual_time = start_time
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float):
+        """Move the virtual clock forward."""
+        self._virtual_time += seconds
@@ -0,0 +1,408 @@
+import random
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+from config.settings import ACTION_SETTINGS, BATTLE_SETTINGS, SIMULATOR_SETTINGS
+from utils.memory import BudgetedCache
+
+
+class Scene:
+    """Scenes of the simulated game."""
+
+    OVERWORLD = 'overworld'
+    FADE = 'fade'  # black screen after teleporting
+    FISHING = 'fishing'  # rod cast, waiting for a bite
+    BITE = 'bite'  # "Oh! A bite!", confirm to hook
+    MESSAGE = 'message'  # overworld message waiting for confirm
+    BATTLE_ENTER = 'battle_enter'
+    BATTLE_INTRO = 'battle_intro'
+    ACTION_MENU = 'action_menu'
+    MOVE_MENU = 'move_menu'
+    BAG = 'bag'
+    ANIMATING = 'animating'
+    BATTLE_MESSAGE = 'battle_message'
+    BATTLE_EXIT = 'battle_exit'
+
+    BLACK = (FADE, BATTLE_ENTER, BATTLE_EXIT)
+    BATTLE = (BATTLE_INTRO, ACTION_MENU, MOVE_MENU, BAG, ANIMATING, BATTLE_MESSAGE)
+
+
+class GameSimulator:
+    """
+    Minimal model of the PokéMMO fishing loop.
+
+    It reacts to key input the way the bot expects the game to, advances on an
+    injected clock and renders synthetic frames whose UI regions use the
+    colors configured in BATTLE_SETTINGS, so the real detectors work on them.
+    """
+
+    DIRECTIONS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+
+    # Colors of the synthetic frames
+    GRASS = (88, 168, 72)
+    GRID = (72, 144, 56)
+    WATER = ((56, 120, 200), (72, 136, 216))
+    PLAYER = (208, 56, 48)
+    BATTLE_BACKGROUND = (200, 216, 232)
+    TILE_PIXELS = 8
+
+    def __init__(self, clock: Callable[[], float], seed: Optional[int] = None):
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.width, self.height = SIMULATOR_SETTINGS['window_size']
+
+        self.frozen = False
+        self.frozen_frame = None
+        self.scene = Scene.OVERWORLD
+        self.scene_until = None
+        self.position = (0.0, 0.0)
+        self.facing = 'down'
+        self.held_keys: Dict[str, float] = {}
+        self.overworld_since = clock()
+
+        self.bite = False
+        self.species = None
+        self.cursor = (0, 0)
+        self.move_cursor = (0, 0)
+        self.after_message = None
+        self.after_animation = None
+
+        # Ground truth for regression checks
+        self.stats = {
+            'teleports': 0,
+            'casts': 0,
+            'missed_casts': 0,
+            'bites': 0,
+            'battles': 0,
+            'fled': 0,
+            'fainted': 0,
+            'caught': 0,
+            'freezes': 0,
+            'restarts': 0,
+        }
+        self.species_seen: Dict[str, int] = {}
+
+        self.fishing_spot = self._route_end()
+        self._regions = {
+            name: self._to_pixels(region) for name, region in BATTLE_SETTINGS['regions'].items()
+        }
+        self._sprites = {name: self.render_sprite(name) for name in SIMULATOR_SETTINGS['species']}
+        self._overworld_frames = BudgetedCache('simulator.overworld_frames')
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+
+    def key_down(self, key: str):
+        """A key was pressed and is held."""
+        if self.frozen:
+            return
+        self.update()
+        if key in self.DIRECTIONS and self.scene == Scene.OVERWORLD:
+            self.held_keys[key] = self.clock()
+            self.facing = key
+        elif key not in self.DIRECTIONS:
+            self._on_press(key)
+        elif self.scene in (Scene.ACTION_MENU, Scene.MOVE_MENU):
+            self._move_cursor(key)
+
+    def key_up(self, key: str):
+        """A held key was released."""
+        if self.frozen:
+            return
+        self.update()
+        start = self.held_keys.pop(key, None)
+        if start is not None:
+            self.position = self._walk(self.position, key, self.clock() - max(start, self.overworld_since))
+
+    def press(self, key: str):
+        """A key was pressed and released."""
+        self.key_down(key)
+        self.key_up(key)
+
+    def _on_press(self, key: str):
+        """Handle a non-arrow key press in the current scene."""
+        now = self.clock()
+        confirm = key == BATTLE_SETTINGS['confirm_key']
+
+        if key == ACTION_SETTINGS['teleport']['key'] and self.scene == Scene.OVERWORLD:
+            self.stats['teleports'] += 1
+            self.held_keys.clear()
+            self._set_scene(Scene.FADE, SIMULATOR_SETTINGS['fade_time'])
+            if self.rng.random() < SIMULATOR_SETTINGS['freeze_rate']:
+                self.frozen = True
+                self.stats['freezes'] += 1
+
+        elif confirm and self.scene == Scene.OVERWORLD:
+            self.stats['casts'] += 1
+            if not self._at_fishing_spot():
+                self.stats['missed_casts'] += 1
+                return
+            self.bite = self.rng.random() < SIMULATOR_SETTINGS['hook_rate']
+            self._set_scene(Scene.FISHING, self.rng.uniform(*SIMULATOR_SETTINGS['bite_delay']))
+
+        elif confirm and self.scene == Scene.BITE:
+            self.stats['battles'] += 1
+            self.species = self.rng.choice(sorted(SIMULATOR_SETTINGS['species']))
+            self.species_seen[self.species] = self.species_seen.get(self.species, 0) + 1
+            self.cursor = (0, 0)
+            self._set_scene(Scene.BATTLE_ENTER, SIMULATOR_SETTINGS['battle_transition'])
+
+        elif confirm and self.scene == Scene.MESSAGE:
+            self._enter_overworld()
+
+        elif confirm and self.scene == Scene.BATTLE_MESSAGE:
+            self._set_scene(self.after_message)
+            if self.after_message == Scene.BATTLE_EXIT:
+                self.scene_until = now + SIMULATOR_SETTINGS['battle_transition']
+
+        elif confirm and self.scene == Scene.ACTION_MENU:
+            self._select_action()
+
+        elif confirm and self.scene == Scene.MOVE_MENU:
+            fainted = self.rng.random() < SIMULATOR_SETTINGS['faint_chance']
+            self._animate('fainted' if fainted else None)
+
+        elif confirm and self.scene == Scene.BAG:
+            caught = self.rng.random() < SIMULATOR_SETTINGS['catch_chance']
+            self._animate('caught' if caught else None)
+
+        elif key == BATTLE_SETTINGS['back_key'] and self.scene in (Scene.MOVE_MENU, Scene.BAG):
+            self._set_scene(Scene.ACTION_MENU)
+
+    def _move_cursor(self, key: str):
+        """Move the cursor of the 2x2 battle menus."""
+        dx, dy = self.DIRECTIONS[key]
+        attribute = 'cursor' if self.scene == Scene.ACTION_MENU else 'move_cursor'
+        column, row = getattr(self, attribute)
+        setattr(self, attribute, (min(1, max(0, column + dx)), min(1, max(0, row + dy))))
+
+    def _select_action(self):
+        """Confirm the highlighted action menu entry."""
+        if self.cursor == (0, 0):
+            self._set_scene(Scene.MOVE_MENU)
+        elif self.cursor == (1, 0):
+            self._set_scene(Scene.BAG)
+        elif self.cursor == (1, 1):
+            if self.rng.random() < SIMULATOR_SETTINGS['run_success']:
+                self._end_battle('fled')
+            else:
+                self._show_battle_message(Scene.ACTION_MENU)
+
+    def _animate(self, outcome: Optional[str]):
+        """Play a turn animation, then end the battle or go back to the menu."""
+        self.after_animation = outcome
+        self._set_scene(Scene.ANIMATING, SIMULATOR_SETTINGS['turn_time'])
+
+    def _end_battle(self, outcome: str):
+        """Show the closing message and leave the battle after it."""
+        self.stats[outcome] += 1
+        self._show_battle_message(Scene.BATTLE_EXIT)
+
+    def _show_battle_message(self, after: str):
+        self.after_message = after
+        self._set_scene(Scene.BATTLE_MESSAGE)
+
+    def restart(self):
+        """Relaunch the client: unfreeze and start over in the overworld."""
+        self.stats['restarts'] += 1
+        self.frozen = False
+        self.frozen_frame = None
+        self.held_keys.clear()
+        self.species = None
+        self.position = (0.0, 0.0)
+        self.facing = 'down'
+        self._enter_overworld()
+
+    # ------------------------------------------------------------------
+    # Time
+    # ------------------------------------------------------------------
+
+    def update(self):
+        """Apply all timed scene transitions that are due."""
+        while self.scene_until is not None and self.clock() >= self.scene_until:
+            due = self.scene_until
+            self.scene_until = None
+
+            if self.scene == Scene.FADE:
+                self.position = (0.0, 0.0)
+                self.facing = 'down'
+                self._enter_overworld(due)
+            elif self.scene == Scene.FISHING:
+                if self.bite:
+                    self.stats['bites'] += 1
+                    self._set_scene(Scene.BITE, SIMULATOR_SETTINGS['bite_window'], due)
+                else:
+                    self._set_scene(Scene.MESSAGE)
+            elif self.scene == Scene.BITE:
+                # Too slow, it got away
+                self._set_scene(Scene.MESSAGE)
+            elif self.scene == Scene.BATTLE_ENTER:
+                self._set_scene(Scene.BATTLE_INTRO, SIMULATOR_SETTINGS['battle_intro'], due)
+            elif self.scene == Scene.BATTLE_INTRO:
+                self._set_scene(Scene.ACTION_MENU)
+            elif self.scene == Scene.ANIMATING:
+                if self.after_animation:
+                    self._end_battle(self.after_animation)
+                else:
+                    self._set_scene(Scene.ACTION_MENU)
+            elif self.scene == Scene.BATTLE_EXIT:
+                self.species = None
+                self._enter_overworld(due)
+
+    def _set_scene(self, scene: str, duration: Optional[float] = None, start: Optional[float] = None):
+        self.scene = scene
+        if duration is None:
+            self.scene_until = None
+        else:
+            self.scene_until = (self.clock() if start is None else start) + duration
+
+    def _enter_overworld(self, since: Optional[float] = None):
+        self._set_scene(Scene.OVERWORLD)
+        self.overworld_since = self.clock() if since is None else since
+
+    # ------------------------------------------------------------------
+    # Movement
+    # ------------------------------------------------------------------
+
+    def _walk(self, position: Tuple[float, float], key: str, duration: float) -> Tuple[float, float]:
+        """Move along a direction; the shore stops the player from walking into the water."""
+        dx, dy = self.DIRECTIONS[key]
+        distance = max(0.0, duration) * SIMULATOR_SETTINGS['walk_speed']
+        x = position[0] + dx * distance
+        y = min(position[1] + dy * distance, self.fishing_spot[1])
+        return (x, y)
+
+    def _current_position(self) -> Tuple[float, float]:
+        """Position including keys that are still held."""
+        position = self.position
+        now = self.clock()
+        for key, start in self.held_keys.items():
+            position = self._walk(position, key, now - max(start, self.overworld_since))
+        return position
+
+    def _route_end(self) -> Tuple[float, float]:
+        position = (0.0, 0.0)
+        for key, duration in SIMULATOR_SETTINGS['route']:
+            dx, dy = self.DIRECTIONS[key]
+            distance = duration * SIMULATOR_SETTINGS['walk_speed']
+            position = (position[0] + dx * distance, position[1] + dy * distance)
+        return position
+
+    def _at_fishing_spot(self) -> bool:
+        x, y = self.position
+        spot_x, spot_y = self.fishing_spot
+        distance = ((x - spot_x) ** 2 + (y - spot_y) ** 2) ** 0.5
+        return self.facing == 'down' and distance <= SIMULATOR_SETTINGS['spot_tolerance']
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def render(self) -> np.ndarray:
+        """Render the current frame as an RGB array of the window size."""
+        if self.frozen:
+            # A frozen client keeps showing whatever it showed last
+            if self.frozen_frame is None:
+                self.frozen_frame = self._render()
+            return self.frozen_frame.copy()
+        return self._render()
+
+    def _render(self) -> np.ndarray:
+        self.update()
+        frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        if self.scene in Scene.BLACK:
+            frame[:] = 0
+            return frame
+
+        if self.scene in Scene.BATTLE:
+            self._render_battle(frame)
+        else:
+            self._render_overworld(frame)
+            if self.scene in (Scene.FISHING, Scene.BITE, Scene.MESSAGE):
+                self._fill(frame, 'message_box', BATTLE_SETTINGS['colors']['message_box'])
+        return frame
+
+    def _render_overworld(self, frame: np.ndarray):
+        x, y = self._current_position()
+        tile = self.TILE_PIXELS
+        key = (int(-x * tile) % tile, int(-y * tile) % tile, int(self.clock() * 3) % 2)
+
+        # There are only tile * tile * 2 distinct overworld frames, render each once
+        cached = self._overworld_frames.get(key)
+        if cached is None:
+            cached = np.empty_like(frame)
+            self._draw_overworld(cached, *key)
+            self._overworld_frames.put(key, cached)
+        frame[:] = cached
+
+    def _draw_overworld(self, frame: np.ndarray, grid_x: int, grid_y: int, phase: int):
+        frame[:] = self.GRASS
+        tile = self.TILE_PIXELS
+
+        # Tile grid scrolls with the player
+        frame[:, grid_x::tile] = self.GRID
+        frame[grid_y::tile, :] = self.GRID
+
+        # Animated water along the top edge
+        frame[:tile // 2] = self.WATER[phase]
+        frame[tile // 2:tile] = self.WATER[1 - phase]
+
+        # Player in the middle of the screen
+        center_x, center_y = self.width // 2, self.height // 2
+        frame[center_y - tile // 2:center_y + tile // 2, center_x - tile // 2:center_x + tile // 2] = self.PLAYER
+
+    def _render_battle(self, frame: np.ndarray):
+        frame[:] = self.BATTLE_BACKGROUND
+        colors = BATTLE_SETTINGS['colors']
+        self._fill(frame, 'enemy_hp_box', colors['enemy_hp_box'])
+
+        # Encounter sprite centered in its region
+        x, y, w, h = self._regions['enemy_sprite']
+        sprite = self._sprites[self.species]
+        sprite_h, sprite_w = sprite.shape[:2]
+        top, left = y + (h - sprite_h) // 2, x + (w - sprite_w) // 2
+        target = frame[top:top + sprite_h, left:left + sprite_w]
+        mask = sprite[..., 3] > 0
+        target[mask] = sprite[..., :3][mask]
+
+        if self.scene == Scene.ACTION_MENU:
+            self._fill(frame, 'message_box', colors['message_box'])
+            self._fill(frame, 'action_menu', colors['action_menu'])
+        elif self.scene == Scene.MOVE_MENU:
+            self._fill(frame, 'move_menu', colors['move_menu'])
+        elif self.scene == Scene.BATTLE_MESSAGE:
+            self._fill(frame, 'message_box', colors['message_box'])
+
+    def _fill(self, frame: np.ndarray, region_name: str, color):
+        x, y, w, h = self._regions[region_name]
+        frame[y:y + h, x:x + w] = color
+
+    def _to_pixels(self, relative_region) -> Tuple[int, int, int, int]:
+        rel_x, rel_y, rel_w, rel_h = relative_region
+        return (
+            int(rel_x * self.width),
+            int(rel_y * self.height),
+            max(1, int(rel_w * self.width)),
+            max(1, int(rel_h * self.height)),
+        )
+
+    @staticmethod
+    def render_sprite(species: str) -> np.ndarray:
+        """
+        Draw the synthetic sprite of a species.
+
+        Returns:
+            RGBA array, transparent outside the body
+        """
+        color, shape = SIMULATOR_SETTINGS['species'][species]
+        width, height = {'wide': (36, 20), 'tall': (20, 36), 'square': (28, 28)}[shape]
+
+        # Ellipse-shaped body with an eye
+        rows, cols = np.mgrid[0:height, 0:width]
+        inside = ((cols - width / 2 + 0.5) / (width / 2)) ** 2 + ((rows - height / 2 + 0.5) / (height / 2)) ** 2 <= 1
+        sprite = np.zeros((height, width, 4), dtype=np.uint8)
+        sprite[inside, :3] = color
+        sprite[inside, 3] = 255
+        sprite[height // 3:height // 3 + 3, width // 4:width // 4 + 3, :3] = (24, 24, 24)
+        return sprite
@@ -0,0 +1,206 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+from bot.coordinator import BotCoordinator
+from config.settings import ACTION_SETTINGS, BOT_SETTINGS, CYCLE_SETTINGS, TUNING_SETTINGS
+from simulator.runner import run_simulation
+from utils.logger import setup_logger
+from utils.store import EventStore
+
+
+def run_live(cycles: int) -> Dict[str, Any]:
+    """
+    Run the bot against the running PokéMMO client with the real capture and input backends.
+
+    Returns:
+        Dict with the cycle count, the elapsed seconds (as 'virtual_seconds', like
+        run_simulation()) and the bot's encounter stats
+    """
+    return asyncio.run(_run_live(cycles))
+
+
+async def _run_live(cycles: int) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    # Trial cycles with bad timings stay out of the real statistics
+    coordinator = BotCoordinator(store=EventStore(':memory:'))
+
+    start = loop.time()
+    task = asyncio.ensure_future(coordinator.start())
+    while coordinator.current_cycle < cycles and not task.done():
+        await asyncio.sleep(1.0)
+    await coordinator.stop()
+    await task
+
+    if coordinator.emergency_stop.triggered:
+        raise RuntimeError("Emergency stop pressed, tuning aborted")
+    return {
+        'cycles': coordinator.current_cycle,
+        'virtual_seconds': loop.time() - start,
+        'bot': coordinator.battle_handler.get_stats(),
+    }
+
+
+class TimingOptimizer:
+    """
+    Shortens the bot's waits and hold durations as far as the cycles keep working.
+
+    Every parameter starts at its current value, which must work, and is
+    bisected down towards its lower bound: a trial of simulated cycles at the
+    midpoint either keeps the cycle success rate (judged from what the bot
+    saw on screen: a fishing message or a battle after casting) within
+    max_success_drop of the starting settings or not. Parameters are tuned
+    one after the other, each keeping the values already found.
+
+    Trials run in the simulator by default, which only finds the timings of
+    the simulator's model of the game. With live=True they run against the
+    real client, scored by what the bot sees on the real screen.
+    """
+
+    def __init__(self, trial_cycles: Optional[int] = None, seed: int = 0, live: bool = False):
+        self.logger = setup_logger()
+        self.trial_cycles = trial_cycles or TUNING_SETTINGS['trial_cycles']
+        self.seed = seed
+        self.live = live
+        self.trials: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def parameters() -> List[str]:
+        """Names of the tunable parameters, in tuning order."""
+        steps = ACTION_SETTINGS['walking_to_beach']['steps']
+        return (['teleport.wait_time']
+                + [f'walk.{index}' for index in range(len(steps))]
+                + ['action_delay', 'cycle_delay'])
+
+    @staticmethod
+    def get(name: str) -> float:
+        """Read a parameter from the live settings."""
+        if name == 'teleport.wait_time':
+            return ACTION_SETTINGS['teleport']['wait_time']
+        if name.startswith('walk.'):
+            return ACTION_SETTINGS['walking_to_beach']['steps'][int(name[5:])][1]
+        if name == 'action_delay':
+            return BOT_SETTINGS['action_delay']
+        if name == 'cycle_delay':
+            return CYCLE_SETTINGS['cycle_delay']
+        raise KeyError(f"Unknown timing parameter: {name}")
+
+    @staticmethod
+    def set(name: str, value: float):
+        """Write a parameter into the live settings."""
+        if name == 'teleport.wait_time':
+            ACTION_SETTINGS['teleport']['wait_time'] = value
+        elif name.startswith('walk.'):
+            steps = ACTION_SETTINGS['walking_to_beach']['steps']
+            index = int(name[5:])
+            steps[index] = (steps[index][0], value)
+        elif name == 'action_delay':
+            BOT_SETTINGS['action_delay'] = value
+        elif name == 'cycle_delay':
+            CYCLE_SETTINGS['cycle_delay'] = value
+        else:
+            raise KeyError(f"Unknown timing parameter: {name}")
+
+    def evaluate(self, values: Dict[str, float]) -> Dict[str, float]:
+        """
+        Run one trial with the given parameter values.
+
+        Returns:
+            Dict with the cycle 'success_rate', 'successes_per_hour' and 'cycle_seconds'
+        """
+        saved = {name: self.get(name) for name in values}
+        try:
+            for name, value in values.items():
+                self.set(name, value)
+            if self.live:
+                report = run_live(self.trial_cycles)
+            else:
+                # Same seed for every trial, so trials differ by the settings and not by luck
+                report = run_simulation(self.trial_cycles, self.seed)
+        finally:
+            for name, value in saved.items():
+                self.set(name, value)
+
+        bot = report['bot']
+        hours = report['virtual_seconds'] / 3600
+        score = {
+            'success_rate': bot['casts_seen'] / bot['attempts'] if bot['attempts'] else 0.0,
+            'successes_per_hour': bot['casts_seen'] / hours if hours else 0.0,
+            'cycle_seconds': report['virtual_seconds'] / report['cycles'] if report['cycles'] else 0.0,
+        }
+        self.trials.append({'values': dict(values), **score})
+        return score
+
+    def optimize(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Tune the given parameters (all by default).
+
+        Returns:
+            Dict with the tuned 'values' and the 'baseline' and 'tuned' trial scores
+        """
+        names = names or self.parameters()
+        values = {name: self.get(name) for name in names}
+
+        baseline = self.evaluate(values)
+        required = baseline['success_rate'] - TUNING_SETTINGS['max_success_drop']
+        self.logger.info(
+            f"Baseline: {baseline['success_rate']:.0%} success, {baseline['cycle_seconds']:.2f}s per cycle"
+        )
+
+        for name in names:
+            good = values[name]
+            bad = TUNING_SETTINGS['lower_bounds'].get(name, 0.0)
+
+            # The lower bound itself may already work
+            if self.evaluate({**values, name: bad})['success_rate'] >= required:
+                good = bad
+            else:
+                for _ in range(TUNING_SETTINGS['bisection_steps']):
+                    middle = (good + bad) / 2
+                    if self.evaluate({**values, name: middle})['success_rate'] >= required:
+                        good = middle
+                    else:
+                        bad = middle
+
+                # Stay clear of the edge that was found
+                good = min(values[name], good * (1 + TUNING_SETTINGS['safety_margin']))
+
+            self.logger.info(f"{name}: {values[name]:.3f}s -> {good:.3f}s")
+            values[name] = round(good, 3)
+
+        tuned = self.evaluate(values)
+        return {'values': values, 'baseline': baseline, 'tuned': tuned}
+
+    @staticmethod
+    def overlay(values: Dict[str, float]) -> Dict[str, Any]:
+        """Build the settings overlay (see config.settings.load_overlay) for tuned values."""
+        overlay: Dict[str, Any] = {}
+        if 'teleport.wait_time' in values:
+            overlay.setdefault('ACTION_SETTINGS', {})['teleport'] = {'wait_time': values['teleport.wait_time']}
+
+        steps = [list(step) for step in ACTION_SETTINGS['walking_to_beach']['steps']]
+        walked = [name for name in values if name.startswith('walk.')]
+        for name in walked:
+            steps[int(name[5:])][1] = values[name]
+        if walked:
+            overlay.setdefault('ACTION_SETTINGS', {})['walking_to_beach'] = {'steps': steps}
+
+        if 'action_delay' in values:
+            overlay['BOT_SETTINGS'] = {'action_delay': values['action_delay']}
+        if 'cycle_delay' in values:
+            overlay['CYCLE_SETTINGS'] = {'cycle_delay': values['cycle_delay']}
+        return overlay
+
+    @classmethod
+    def write_overlay(cls, values: Dict[str, float], path: Optional[str] = None, live: bool = False) -> str:
+        """
+        Write the overlay for tuned values as JSON.
+
+        Live results go to overlay_path, which config.settings loads on import
+        when apply_overlay is set; simulator results go to simulated_overlay_path,
+        which is never loaded.
+        """
+        path = path or TUNING_SETTINGS['overlay_path' if live else 'simulated_overlay_path']
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cls.overlay(values), f, indent=4)
+            f.write("\n")
+        return path
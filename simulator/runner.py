@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional
+from bot.coordinator import BotCoordinator
+from bot.sprites import SpriteIndex
+from config.settings import CYCLE_SETTINGS, PROFILER_SETTINGS, SIMULATOR_SETTINGS, SNAPSHOT_SETTINGS, WATCHDOG_SETTINGS
+from simulator.backends import SimulatedCalibrator, SimulatedInput, SimulatedProcessManager, SimulatedScreen
+from simulator.clock import VirtualClockEventLoop
+from simulator.game import GameSimulator
+from utils.store import EventStore
+from utils.tracing import tracer
+
+
+def run_simulation(cycles: int, seed: Optional[int] = None, store_path: str = ':memory:') -> Dict[str, Any]:
+    """
+    Run the full bot against the simulator on a virtual clock.
+
+    Args:
+        cycles: Number of bot cycles to run
+        seed: Random seed for the simulated game
+        store_path: Event store database, in-memory by default
+
+    Returns:
+        Dict with throughput numbers, the bot's encounter stats and the game's ground truth
+    """
+    # The simulated client restarts without a real command line
+    WATCHDOG_SETTINGS['launch_command'] = WATCHDOG_SETTINGS['launch_command'] or 'simulated'
+    # Simulations can run next to the real bot, leave its control port alone
+    PROFILER_SETTINGS['control_port'] = None
+    # No global hotkey listener, it would need a display (EmergencyStop.trigger() still works)
+    CYCLE_SETTINGS['emergency_stop_key'] = None
+    SNAPSHOT_SETTINGS['output_dir'] = SIMULATOR_SETTINGS['snapshot_dir']
+
+    loop = VirtualClockEventLoop()
+    # Spans are recorded on game time, so traces show the simulated timeline
+    wall_clock, tracer.clock = tracer.clock, loop.time
+    try:
+        return loop.run_until_complete(_simulate(loop, cycles, seed, store_path))
+    finally:
+        tracer.clock = wall_clock
+        loop.close()
+
+
+async def _simulate(loop: VirtualClockEventLoop, cycles: int, seed: Optional[int], store_path: str) -> Dict[str, Any]:
+    game = GameSimulator(loop.time, seed)
+
+    sprite_index = SpriteIndex()
+    sprite_index.build_from_images({name: game.render_sprite(name) for name in SIMULATOR_SETTINGS['species']})
+
+    coordinator = BotCoordinator(
+        process_manager=SimulatedProcessManager(game),
+        calibrator=SimulatedCalibrator(game),
+        screen=SimulatedScreen(game),
+        input_backend=SimulatedInput(game),
+        store=EventStore(store_path),
+        sprite_index=sprite_index,
+    )
+    # Dedup windows are in game time, like the rest of the bot
+    coordinator.archiver.clock = loop.time
+
+    wall_start = time.perf_counter()
+    virtual_start = loop.time()
+    task = asyncio.ensure_future(coordinator.start())
+
+    # stop() lets the running cycle finish, so ask for it during the last one
+    while coordinator.current_cycle < cycles and not task.done():
+        await asyncio.sleep(1.0)
+    await coordinator.stop()
+    await task
+
+    wall_seconds = time.perf_counter() - wall_start
+    virtual_seconds = loop.time() - virtual_start
+
+    return {
+        'cycles': coordinator.current_cycle,
+        'wall_seconds': wall_seconds,
+        'virtual_seconds': virtual_seconds,
+        'cycles_per_minute': coordinator.current_cycle * 60 / wall_seconds if wall_seconds else 0.0,
+        'cycles_per_hour': coordinator.current_cycle * 3600 / virtual_seconds if virtual_seconds else 0.0,
+        'bot': coordinator.battle_handler.get_stats(),
+        'watchdog_recoveries': coordinator.watchdog.recoveries,
+        'snapshots': coordinator.archiver.get_stats(),
+        'game': dict(game.stats),
+        # A freeze in the last cycle gets no recovery, stop() was already requested
+        'frozen_at_end': game.frozen,
+        'species_seen': dict(game.species_seen),
+    }
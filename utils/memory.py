@@ -0,0 +1,273 @@
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from config.settings import MEMORY_SETTINGS
+from utils.logger import setup_logger
+from utils.store import EventStore
+
+
+def sizeof(value: Any) -> int:
+    """
+    Size of a cached value in bytes.
+
+    Values with an nbytes attribute (NumPy arrays, RoiPlan) report their own
+    size; anything else falls back to sys.getsizeof(), which does not count
+    the objects it refers to, so caches of such values should store objects
+    that define nbytes.
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    return nbytes if nbytes is not None else sys.getsizeof(value)
+
+
+class BudgetRegistry:
+    """Caches and buffers with a byte budget, so their usage can be reported and enforced."""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, budget: int, size: Callable[[], int],
+                 evict: Optional[Callable[[int], int]] = None):
+        """
+        Register a cache or buffer.
+
+        Args:
+            name: Unique name used in metrics and reports
+            budget: Budget in bytes
+            size: Returns the current size in bytes
+            evict: Frees at least the given number of bytes and returns how many it freed
+        """
+        self.entries[name] = {'budget': budget, 'size': size, 'evict': evict}
+
+    def unregister(self, name: str):
+        self.entries.pop(name, None)
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Get the size and budget of every registered entry."""
+        return {
+            name: {'bytes': entry['size'](), 'budget': entry['budget']}
+            for name, entry in self.entries.items()
+        }
+
+    def enforce(self) -> Dict[str, int]:
+        """
+        Evict from every entry that is over its budget.
+
+        Returns:
+            Bytes freed per entry
+        """
+        freed = {}
+        for name, entry in self.entries.items():
+            excess = entry['size']() - entry['budget']
+            if excess > 0 and entry['evict'] is not None:
+                freed[name] = entry['evict'](excess)
+        return freed
+
+
+# Process-wide registry that caches register themselves with
+budgets = BudgetRegistry()
+
+
+class BudgetedCache:
+    """
+    Mapping that stays within a byte budget.
+
+    When an insert pushes the cache over its budget, entries are evicted
+    according to the policy: 'lru' drops the least recently used entry,
+    'fifo' the oldest inserted one.
+    """
+
+    POLICIES = ('lru', 'fifo')
+
+    def __init__(self, name: str, budget: Optional[int] = None, policy: str = 'lru',
+                 registry: Optional[BudgetRegistry] = None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+
+        self.name = name
+        self.budget = budget if budget is not None else MEMORY_SETTINGS['budgets'][name]
+        self.policy = policy
+        self.nbytes = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+        (registry or budgets).register(name, self.budget, lambda: self.nbytes, self.evict)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.get(key, default)
+        if self.policy == 'lru' and key in self._entries:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Insert a value and evict old entries if the budget is exceeded."""
+        if key in self._entries:
+            self.nbytes -= sizeof(self._entries.pop(key))
+        self._entries[key] = value
+        self.nbytes += sizeof(value)
+
+        if self.nbytes > self.budget:
+            self.evict(self.nbytes - self.budget)
+
+    def evict(self, nbytes: int) -> int:
+        """Evict entries in policy order until at least nbytes were freed."""
+        freed = 0
+        # The newest entry stays even if it alone exceeds the budget
+        while freed < nbytes and len(self._entries) > 1:
+            _, value = self._entries.popitem(last=False)
+            size = sizeof(value)
+            self.nbytes -= size
+            freed += size
+            self.evictions += 1
+        return freed
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+class MemoryMonitor:
+    """
+    Periodically snapshots memory use and reports unexpected growth.
+
+    Every snapshot_interval seconds the RSS, the tracemalloc totals (when
+    enabled) and the usage of every registered budget are written to the
+    event store as metrics. When memory grew by more than growth_threshold
+    since the last baseline, a diff report is written and the baseline moves.
+    """
+
+    def __init__(self, store: EventStore, registry: Optional[BudgetRegistry] = None):
+        self.logger = setup_logger()
+        self.store = store
+        self.registry = registry or budgets
+        self.reports: List[str] = []
+
+        self._baseline_bytes = None
+        self._baseline_snapshot = None
+        self._task = None
+        self._process = None
+
+    def start(self):
+        """Start tracing (if enabled) and the periodic snapshot task."""
+        if self._task is not None:
+            return
+        if MEMORY_SETTINGS['tracemalloc'] and not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_SETTINGS['tracemalloc_frames'])
+
+        self._reset_baseline()
+        self._task = asyncio.ensure_future(self._run())
+        self._task.set_name('memory-monitor')
+        self.logger.info("🧠 Memory monitor started")
+
+    async def stop(self):
+        """Stop the snapshot task and tracing started by start()."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if MEMORY_SETTINGS['tracemalloc'] and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(MEMORY_SETTINGS['snapshot_interval'])
+            try:
+                self.snapshot()
+            except Exception as e:
+                self.logger.error(f"❌ Memory snapshot failed: {e}")
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Take one snapshot, record it as metrics and check for growth.
+
+        Returns:
+            Metric name to value in bytes
+        """
+        self.registry.enforce()
+
+        values = {}
+        rss = self._rss()
+        if rss is not None:
+            values['memory.rss_bytes'] = rss
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            values['memory.traced_bytes'] = current
+            values['memory.traced_peak_bytes'] = peak
+        for name, usage in self.registry.usage().items():
+            values[f'memory.{name}.bytes'] = usage['bytes']
+
+        for name, value in values.items():
+            self.store.record_metric(name, value)
+
+        total = self._tracked_bytes()
+        if total is not None and self._baseline_bytes is not None:
+            growth = total - self._baseline_bytes
+            if growth > MEMORY_SETTINGS['growth_threshold']:
+                self.write_report(growth)
+                self._reset_baseline()
+        return values
+
+    def write_report(self, growth: int) -> str:
+        """
+        Write a report of what grew since the baseline.
+
+        Returns:
+            Path of the report file
+        """
+        lines = [f"Memory grew by {growth / 2**20:.1f} MiB since the last baseline", ""]
+
+        lines.append("Budgets:")
+        for name, usage in sorted(self.registry.usage().items()):
+            share = usage['bytes'] / usage['budget'] if usage['budget'] else 0.0
+            lines.append(f"  {name:<32} {usage['bytes'] / 2**20:8.2f} MiB of {usage['budget'] / 2**20:.2f} MiB ({share:.0%})")
+
+        if self._baseline_snapshot is not None and tracemalloc.is_tracing():
+            lines += ["", f"Top {MEMORY_SETTINGS['report_top']} allocation sites by growth:"]
+            stats = tracemalloc.take_snapshot().compare_to(self._baseline_snapshot, 'lineno')
+            for stat in stats[:MEMORY_SETTINGS['report_top']]:
+                lines.append(f"  {stat}")
+        else:
+            lines += ["", "Enable MEMORY_SETTINGS['tracemalloc'] for allocation sites."]
+
+        os.makedirs(MEMORY_SETTINGS['report_dir'], exist_ok=True)
+        path = os.path.join(MEMORY_SETTINGS['report_dir'], time.strftime('memory-%Y%m%d-%H%M%S.txt'))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        self.reports.append(path)
+        self.logger.warning(f"⚠️ Memory grew by {growth / 2**20:.1f} MiB, report written to {path}")
+        return path
+
+    def _reset_baseline(self):
+        self._baseline_bytes = self._tracked_bytes()
+        if tracemalloc.is_tracing():
+            self._baseline_snapshot = tracemalloc.take_snapshot()
+
+    def _tracked_bytes(self) -> Optional[int]:
+        """The number growth is measured on: traced memory if tracing, RSS otherwise."""
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return self._rss()
+
+    def _rss(self) -> Optional[int]:
+        if self._process is None:
+            # psutil is only needed for RSS, tracemalloc and budgets work without it
+            try:
+                import psutil
+                self._process = psutil.Process()
+            except ImportError:
+                self.logger.debug("psutil not installed, RSS is not recorded")
+                self._process = False
+        return self._process.memory_info().rss if self._process else None
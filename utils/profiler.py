@@ -0,0 +1,189 @@
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from config.settings import PROFILER_SETTINGS
+from utils.logger import setup_logger
+from utils.tracing import tracer
+
+
+class SamplingProfiler:
+    """
+    On-demand sampling profiler for the main thread and worker threads.
+
+    Nothing runs until a profile is requested (SIGUSR1 or the local control
+    socket); then a sampler thread walks every thread's stack at
+    sample_interval for the requested number of seconds and writes collapsed
+    stacks ("frame;frame;frame count" lines, as read by flamegraph.pl and
+    speedscope). Each sample is prefixed with the coordinator's current cycle
+    and step set through tag().
+    """
+
+    def __init__(self):
+        self.logger = setup_logger()
+        self.tags: Dict[str, Any] = {'cycle': None, 'step': None}
+        self.last_output: Optional[str] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._server = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def tag(self, **tags):
+        """Update the tags attached to samples (a dict update, cheap enough to call per step)."""
+        self.tags.update(tags)
+
+    def start(self, seconds: Optional[float] = None) -> Optional[str]:
+        """
+        Start sampling in the background.
+
+        Args:
+            seconds: How long to sample, PROFILER_SETTINGS['default_seconds'] if not given
+
+        Returns:
+            Path the collapsed stacks will be written to, or None if a profile is already running
+        """
+        if self.running:
+            return None
+
+        seconds = seconds or PROFILER_SETTINGS['default_seconds']
+        os.makedirs(PROFILER_SETTINGS['output_dir'], exist_ok=True)
+        path = os.path.join(PROFILER_SETTINGS['output_dir'], time.strftime('profile-%Y%m%d-%H%M%S.folded'))
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, args=(seconds, path), name='profiler', daemon=True)
+        self._thread.start()
+        self.logger.info(f"🔬 Profiling for {seconds:g}s -> {path}")
+        return path
+
+    def stop(self):
+        """Stop a running profile early; what was sampled so far is still written."""
+        self._stop.set()
+
+    def toggle(self):
+        """Start a profile with the default duration, or stop the running one."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def _sample(self, seconds: float, path: str):
+        """Sampler thread: collect stacks until the time is up, then write them."""
+        interval = PROFILER_SETTINGS['sample_interval']
+        own_ident = threading.get_ident()
+        counts = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline and not self._stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            prefix = f"cycle:{self.tags['cycle']};step:{self.tags['step'] or 'idle'}"
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.append(prefix)
+                counts[';'.join(reversed(stack))] += 1
+
+            samples += 1
+            self._stop.wait(interval)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self.last_output = path
+        self.logger.info(f"🔬 Profile written to {path} ({samples} samples)")
+
+    @staticmethod
+    def toggle_tracing() -> Optional[str]:
+        """Switch span tracing on, or off with an export of what was recorded."""
+        if tracer.enabled:
+            return tracer.disable()
+        tracer.enable()
+        return None
+
+    async def install(self):
+        """Listen for SIGUSR1 (profile), SIGUSR2 (tracing) and on the local control socket, if configured."""
+        loop = asyncio.get_running_loop()
+
+        # Windows has no SIGUSR1/SIGUSR2, the control socket works everywhere
+        for name, handler in (('SIGUSR1', self.toggle), ('SIGUSR2', self.toggle_tracing)):
+            if hasattr(signal, name):
+                try:
+                    loop.add_signal_handler(getattr(signal, name), handler)
+                except (NotImplementedError, RuntimeError, ValueError) as e:
+                    self.logger.debug(f"{name} handler not installed: {e}")
+
+        port = PROFILER_SETTINGS['control_port']
+        if port:
+            try:
+                self._server = await asyncio.start_server(self._handle_control, '127.0.0.1', port)
+                self.logger.info(f"🔬 Profiler control listening on 127.0.0.1:{port}")
+            except OSError as e:
+                self.logger.warning(f"⚠️ Profiler control socket unavailable: {e}")
+
+    async def uninstall(self):
+        """Stop listening and finish any running profile."""
+        for name in ('SIGUSR1', 'SIGUSR2'):
+            if hasattr(signal, name):
+                try:
+                    asyncio.get_running_loop().remove_signal_handler(getattr(signal, name))
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.stop()
+
+    async def _handle_control(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve one control command per connection.
+
+        Commands: "start [seconds]", "stop", "status", "trace-start", "trace-stop".
+        """
+        try:
+            words = (await reader.readline()).decode(errors='replace').split()
+            command = words[0] if words else 'status'
+
+            if command == 'start':
+                seconds = float(words[1]) if len(words) > 1 else None
+                path = self.start(seconds)
+                reply = f"started {path}" if path else "busy"
+            elif command == 'stop':
+                self.stop()
+                reply = "stopping"
+            elif command == 'trace-start':
+                tracer.enable()
+                reply = "tracing"
+            elif command == 'trace-stop':
+                path = tracer.disable() if tracer.enabled else None
+                reply = f"trace {path}" if path else "no trace recorded"
+            elif command == 'status':
+                reply = "running" if self.running else f"idle {self.last_output or ''}".strip()
+            else:
+                reply = f"unknown command: {command}"
+        except ValueError as e:
+            reply = f"error: {e}"
+
+        writer.write(f"{reply}\n".encode())
+        await writer.drain()
+        writer.close()
+
+
+# Process-wide profiler, so any component can tag samples
+profiler = SamplingProfiler()
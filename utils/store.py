@@ -0,0 +1,379 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from config.settings import STORE_SETTINGS
+from utils.logger import setup_logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    cycle INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    encountered INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_started_at ON cycles (started_at);
+-- Covers time-filtered percentile walks without touching the table
+DROP INDEX IF EXISTS idx_cycles_duration;
+CREATE INDEX IF NOT EXISTS idx_cycles_duration_started_at ON cycles (duration, started_at);
+
+-- Per-hour rollup of cycles, maintained by the writer so aggregates never scan the raw table
+CREATE TABLE IF NOT EXISTS cycle_hours (
+    hour INTEGER PRIMARY KEY,
+    cycles INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    encounters INTEGER NOT NULL,
+    duration_sum REAL NOT NULL,
+    first_started REAL NOT NULL,
+    last_started REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS encounters (
+    id INTEGER PRIMARY KEY,
+    cycle INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    species TEXT,
+    confidence REAL,
+    outcome TEXT NOT NULL,
+    turns INTEGER NOT NULL,
+    entry_time REAL,
+    battle_time REAL,
+    exit_time REAL
+);
+CREATE INDEX IF NOT EXISTS idx_encounters_ts ON encounters (ts);
+CREATE INDEX IF NOT EXISTS idx_encounters_species ON encounters (species);
+
+CREATE TABLE IF NOT EXISTS failures (
+    id INTEGER PRIMARY KEY,
+    cycle INTEGER,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_failures_ts ON failures (ts);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name_ts ON metrics (name, ts);
+"""
+
+INSERTS = {
+    'cycles': "INSERT INTO cycles (cycle, started_at, duration, success, encountered, error) VALUES (?, ?, ?, ?, ?, ?)",
+    'encounters': (
+        "INSERT INTO encounters (cycle, ts, species, confidence, outcome, turns, entry_time, battle_time, exit_time) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    ),
+    'failures': "INSERT INTO failures (cycle, ts, kind, message) VALUES (?, ?, ?, ?)",
+    'metrics': "INSERT INTO metrics (ts, name, value) VALUES (?, ?, ?)",
+}
+
+UPSERT_CYCLE_HOUR = """
+INSERT INTO cycle_hours (hour, cycles, successes, encounters, duration_sum, first_started, last_started)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (hour) DO UPDATE SET
+    cycles = cycles + excluded.cycles,
+    successes = successes + excluded.successes,
+    encounters = encounters + excluded.encounters,
+    duration_sum = duration_sum + excluded.duration_sum,
+    first_started = MIN(first_started, excluded.first_started),
+    last_started = MAX(last_started, excluded.last_started)
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the store database in WAL mode and make sure the schema exists."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class EventStore:
+    """
+    Append-only store for cycles, encounters, failures and metrics.
+
+    Records are queued without blocking and written by a background thread
+    in batched transactions, so the action loop never waits on disk I/O.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.logger = setup_logger()
+        self.path = path or STORE_SETTINGS['path']
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=STORE_SETTINGS['queue_size'])
+        self._thread = None
+
+    def open(self):
+        """Create the database and start the writer thread."""
+        if self._thread is not None:
+            return
+
+        connection = connect(self.path)
+        self._thread = threading.Thread(target=self._writer, args=(connection,), name='EventStoreWriter', daemon=True)
+        self._thread.start()
+        self.logger.info(f"🗄️ Event store opened at {self.path}")
+
+    def close(self):
+        """Flush pending records and stop the writer thread."""
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        if self.dropped:
+            self.logger.warning(f"⚠️ Event store dropped {self.dropped} record(s) because the queue was full")
+        self.logger.info("🗄️ Event store closed")
+
+    def record_cycle(self, cycle: int, started_at: float, duration: float, success: bool,
+                     encountered: bool, error: Optional[str] = None):
+        """Queue a finished cycle."""
+        self._put('cycles', (cycle, started_at, duration, int(success), int(encountered), error))
+
+    def record_encounter(self, cycle: int, result: Dict[str, Any]):
+        """Queue an encounter from a BattleHandler.handle_encounter() result."""
+        timings = result.get('timings', {})
+        self._put('encounters', (
+            cycle,
+            time.time(),
+            result.get('species'),
+            result.get('species_confidence'),
+            result['outcome'],
+            result['turns'],
+            timings.get('entry'),
+            timings.get('battle'),
+            timings.get('exit'),
+        ))
+
+    def record_failure(self, cycle: Optional[int], kind: str, message: str):
+        """Queue a failure such as an exception or a timeout."""
+        self._put('failures', (cycle, time.time(), kind, message))
+
+    def record_metric(self, name: str, value: float):
+        """Queue a named measurement, e.g. a recovery time."""
+        self._put('metrics', (time.time(), name, value))
+
+    def _put(self, table: str, row: Tuple):
+        """Hand a row to the writer thread without ever blocking."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self.dropped += 1
+
+    def _writer(self, connection: sqlite3.Connection):
+        """Drain the queue and write rows in batches."""
+        batch_size = STORE_SETTINGS['batch_size']
+        flush_interval = STORE_SETTINGS['flush_interval']
+        running = True
+
+        while running:
+            batch: Dict[str, List[Tuple]] = {}
+            count = 0
+            deadline = time.monotonic() + flush_interval
+
+            while count < batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                table, row = item
+                batch.setdefault(table, []).append(row)
+                count += 1
+
+            if not batch:
+                continue
+
+            try:
+                with connection:
+                    for table, rows in batch.items():
+                        connection.executemany(INSERTS[table], rows)
+                    if 'cycles' in batch:
+                        connection.executemany(UPSERT_CYCLE_HOUR, self._rollup(batch['cycles']))
+            except sqlite3.Error as e:
+                self.logger.error(f"❌ Event store write failed, {count} record(s) lost: {e}")
+
+        connection.close()
+
+    @staticmethod
+    def _rollup(rows: List[Tuple]) -> List[Tuple]:
+        """Aggregate cycle rows into per-hour rollup rows."""
+        hours: Dict[int, List] = {}
+        for _, started_at, duration, success, encountered, _ in rows:
+            hour = int(started_at // 3600)
+            bucket = hours.get(hour)
+            if bucket is None:
+                hours[hour] = [1, success, encountered, duration, started_at, started_at]
+            else:
+                bucket[0] += 1
+                bucket[1] += success
+                bucket[2] += encountered
+                bucket[3] += duration
+                bucket[4] = min(bucket[4], started_at)
+                bucket[5] = max(bucket[5], started_at)
+        return [(hour, *bucket) for hour, bucket in hours.items()]
+
+
+class StoreQueries:
+    """Aggregate queries over an event store database."""
+
+    # Time windows with at most this many cycles are sorted in memory, larger ones walk the duration index
+    SORT_LIMIT = 100000
+
+    def __init__(self, path: Optional[str] = None):
+        self.connection = connect(path or STORE_SETTINGS['path'])
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def _hour_rows(self, since: float) -> List[Tuple]:
+        """
+        Get per-hour cycle aggregates from the rollup table.
+
+        The hour containing `since` is only partly inside the window, so it is
+        aggregated from the raw cycles instead.
+
+        Returns:
+            List of (hour, cycles, successes, encounters, duration_sum, first_started, last_started)
+        """
+        first_full_hour = int(-(-since // 3600))
+        rows = self.connection.execute(
+            "SELECT hour, cycles, successes, encounters, duration_sum, first_started, last_started "
+            "FROM cycle_hours WHERE hour >= ? ORDER BY hour",
+            (first_full_hour,),
+        ).fetchall()
+
+        if since and since < first_full_hour * 3600:
+            partial = self.connection.execute(
+                "SELECT COUNT(*), SUM(success), SUM(encountered), SUM(duration), MIN(started_at), MAX(started_at) "
+                "FROM cycles WHERE started_at >= ? AND started_at < ?",
+                (since, first_full_hour * 3600),
+            ).fetchone()
+            if partial[0]:
+                rows.insert(0, (first_full_hour - 1, *partial))
+
+        return rows
+
+    def cycle_summary(self, since: float = 0.0) -> Dict[str, Any]:
+        """
+        Summarize cycles started after a timestamp.
+
+        Returns:
+            Dict with cycle count, success rate, hook rate, mean duration and cycles per hour
+        """
+        rows = self._hour_rows(since)
+        count = sum(row[1] for row in rows)
+        if not count:
+            return {'cycles': 0, 'success_rate': 0.0, 'hook_rate': 0.0, 'mean_duration': 0.0, 'cycles_per_hour': 0.0}
+
+        first = min(row[5] for row in rows)
+        last = max(row[6] for row in rows)
+        span_hours = (last - first) / 3600
+
+        return {
+            'cycles': count,
+            'success_rate': sum(row[2] for row in rows) / count,
+            'hook_rate': sum(row[3] for row in rows) / count,
+            'mean_duration': sum(row[4] for row in rows) / count,
+            'cycles_per_hour': count / span_hours if span_hours else 0.0,
+        }
+
+    def duration_percentiles(self, percentiles=(50, 90, 99), since: float = 0.0) -> Dict[int, float]:
+        """
+        Get cycle duration percentiles (nearest rank).
+
+        The (duration, started_at) index is walked once per percentile, filtering
+        on the index entries alone; small time windows are cheaper to sort in memory.
+        """
+        count = self.connection.execute("SELECT COUNT(*) FROM cycles WHERE started_at >= ?", (since,)).fetchone()[0]
+        if not count:
+            return {}
+
+        durations = None
+        if since and count <= self.SORT_LIMIT:
+            durations = sorted(row[0] for row in self.connection.execute(
+                "SELECT duration FROM cycles WHERE started_at >= ?", (since,)
+            ))
+
+        result = {}
+        for percentile in percentiles:
+            offset = min(count - 1, max(0, int(round(percentile / 100 * count)) - 1))
+            if durations is not None:
+                result[percentile] = durations[offset]
+            else:
+                result[percentile] = self.connection.execute(
+                    "SELECT duration FROM cycles INDEXED BY idx_cycles_duration_started_at "
+                    "WHERE started_at >= ? ORDER BY duration LIMIT 1 OFFSET ?",
+                    (since, offset),
+                ).fetchone()[0]
+        return result
+
+    def hourly(self, since: float = 0.0) -> List[Tuple[str, int, float, float]]:
+        """
+        Break cycles down per hour.
+
+        Returns:
+            List of (hour, cycles, hook rate, mean duration)
+        """
+        return [
+            (time.strftime('%Y-%m-%d %H:00', time.localtime(hour * 3600)), count, encounters / count, duration_sum / count)
+            for hour, count, _, encounters, duration_sum, _, _ in self._hour_rows(since)
+        ]
+
+    def species_frequency(self, since: float = 0.0) -> List[Tuple[str, int]]:
+        """
+        Count encounters per species, most frequent first.
+
+        Returns:
+            List of (species, count), unidentified encounters are reported as 'unknown'
+        """
+        return self.connection.execute(
+            "SELECT COALESCE(species, 'unknown') AS name, COUNT(*) FROM encounters "
+            "WHERE ts >= ? GROUP BY name ORDER BY COUNT(*) DESC",
+            (since,),
+        ).fetchall()
+
+    def failure_counts(self, since: float = 0.0) -> List[Tuple[str, int]]:
+        """
+        Count failures per kind.
+
+        Returns:
+            List of (kind, count), most frequent first
+        """
+        return self.connection.execute(
+            "SELECT kind, COUNT(*) FROM failures WHERE ts >= ? GROUP BY kind ORDER BY COUNT(*) DESC",
+            (since,),
+        ).fetchall()
+
+    def metric_summaries(self, since: float = 0.0) -> List[Tuple[str, int, float, float]]:
+        """
+        Summarize each metric.
+
+        Returns:
+            List of (name, count, mean, max)
+        """
+        return self.connection.execute(
+            "SELECT name, COUNT(*), AVG(value), MAX(value) FROM metrics WHERE ts >= ? GROUP BY name ORDER BY name",
+            (since,),
+        ).fetchall()
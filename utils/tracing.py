@@ -0,0 +1,214 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+from config.settings import MEMORY_SETTINGS, TRACING_SETTINGS
+from utils.logger import setup_logger
+from utils.memory import budgets
+
+
+class _NullSpan:
+    """Span returned while tracing is off: entering and leaving it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = self.tracer.clock()
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or {}, error=exc_type.__name__)
+        self.tracer._add(self.name, self.category, self.start, end - self.start, args)
+        return False
+
+
+class Tracer:
+    """
+    Records spans in memory and exports them as Chrome Trace Event JSON.
+
+    Open the export in chrome://tracing or https://ui.perfetto.dev. While
+    disabled, span() hands out a shared no-op span, so instrumented code only
+    pays for one attribute check. Spans are laid out per thread and per named
+    asyncio task, so concurrent tasks on the event loop get separate rows.
+    """
+
+    # Approximate memory of one recorded span (event dict, args and floats), measured with tracemalloc
+    EVENT_BYTES = 420
+
+    def __init__(self):
+        self.logger = setup_logger()
+        self.enabled = TRACING_SETTINGS['enabled']
+        self.clock: Callable[[], float] = time.perf_counter
+        self.events = deque(maxlen=TRACING_SETTINGS['max_events'])
+
+        self._pid = os.getpid()
+        self._tids: Dict[Tuple[int, str], int] = {}
+        self._lock = threading.Lock()
+
+        budgets.register('tracing.events', MEMORY_SETTINGS['budgets']['tracing.events'], self.nbytes, self.evict)
+
+    def enable(self, clock: Optional[Callable[[], float]] = None):
+        """Start recording, optionally on another clock (e.g. the simulator's virtual time)."""
+        if clock is not None:
+            self.clock = clock
+        self.enabled = True
+        self.logger.info("🧵 Tracing enabled")
+
+    def disable(self, export: bool = True) -> Optional[str]:
+        """
+        Stop recording.
+
+        Returns:
+            Path of the exported trace, if any spans were recorded and export is True
+        """
+        self.enabled = False
+        path = self.export() if export and self.events else None
+        self.clear()
+        return path
+
+    def nbytes(self) -> int:
+        return len(self.events) * self.EVENT_BYTES
+
+    def evict(self, nbytes: int) -> int:
+        """Drop the oldest events until about nbytes were freed."""
+        with self._lock:
+            count = min(len(self.events), -(-nbytes // self.EVENT_BYTES))
+            for _ in range(count):
+                self.events.popleft()
+        return count * self.EVENT_BYTES
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self._tids.clear()
+
+    def span(self, name: str, category: str, **args):
+        """Context manager measuring the enclosed block."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args or None)
+
+    def instant(self, name: str, category: str, **args):
+        """Record a point in time."""
+        if self.enabled:
+            event = {'name': name, 'cat': category, 'ph': 'i', 's': 't', 'ts': self.clock() * 1e6}
+            if args:
+                event['args'] = args
+            self._append(event)
+
+    def export(self, path: Optional[str] = None) -> str:
+        """
+        Write the recorded spans as Chrome Trace Event JSON.
+
+        Only copying the events happens on the caller's thread; the file is
+        written by a separate thread, so exporting from the event loop (signal
+        handler, control socket) does not stall the bot. The thread is not a
+        daemon, so an export started at shutdown still completes.
+
+        Returns:
+            Path the trace is being written to
+        """
+        if path is None:
+            os.makedirs(TRACING_SETTINGS['output_dir'], exist_ok=True)
+            path = os.path.join(TRACING_SETTINGS['output_dir'], time.strftime('trace-%Y%m%d-%H%M%S.json'))
+
+        with self._lock:
+            events = list(self.events)
+            names = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': label}}
+                for (_, label), tid in self._tids.items()
+            ]
+
+        threading.Thread(target=self._write, args=(path, names + events), name='trace-export').start()
+        return path
+
+    def _write(self, path: str, events: list):
+        """Export thread: serialize the copied events."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        self.logger.info(f"🧵 Trace with {len(events)} events written to {path}")
+
+    def _add(self, name: str, category: str, start: float, duration: float, args: Optional[Dict[str, Any]]):
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6}
+        if args:
+            event['args'] = args
+        self._append(event)
+
+    def _append(self, event: Dict[str, Any]):
+        event['pid'] = self._pid
+        event['tid'] = self._tid()
+        with self._lock:
+            self.events.append(event)
+
+    def _tid(self) -> int:
+        """Row for the calling thread, or the calling asyncio task on the event loop."""
+        thread = threading.current_thread()
+        label = thread.name
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            label = task.get_name()
+
+        key = (thread.ident, label)
+        tid = self._tids.get(key)
+        if tid is None:
+            with self._lock:
+                tid = self._tids.setdefault(key, len(self._tids) + 1)
+        return tid
+
+
+# Process-wide tracer, so every component records into the same trace
+tracer = Tracer()
+
+
+def traced(category: str, name: Optional[str] = None):
+    """Decorator wrapping every call of a function or coroutine function in a span."""
+
+    def decorate(func):
+        label = name or func.__name__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with tracer.span(label, category):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(label, category):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate